@@ -23,7 +23,7 @@ def calculate_rolling_stats(df, window=30):
 
 
 def calculate_seasonal_stats(df):
-    seasonal_stats = df.groupby('season')['temperature'].agg([
+    seasonal_stats = df.groupby('season', observed=True)['temperature'].agg([
         'mean', 'std', 'min', 'max', 'count'
     ]).reset_index()
     seasonal_stats.columns = ['season', 'mean', 'std', 'min', 'max', 'count']
@@ -53,9 +53,10 @@ def detect_anomalies(df, seasonal_stats):
 
     df['is_anomaly'] = df.apply(check_anomaly, axis=1)
 
-    df['season_lower'] = df['season'].map(lambda s: season_bounds[s]['lower'])
-    df['season_upper'] = df['season'].map(lambda s: season_bounds[s]['upper'])
-    df['season_mean'] = df['season'].map(lambda s: season_bounds[s]['mean'])
+    seasons = df['season'].astype(str)
+    df['season_lower'] = seasons.map(lambda s: season_bounds[s]['lower'])
+    df['season_upper'] = seasons.map(lambda s: season_bounds[s]['upper'])
+    df['season_mean'] = seasons.map(lambda s: season_bounds[s]['mean'])
 
     return df
 
@@ -131,22 +132,103 @@ def analyze_sequential(df):
     return results, execution_time
 
 
-def analyze_parallel(df, max_workers=None):
+def _analyze_with_executor(df, executor):
+    cities = df['city'].unique()
+    city_data_list = [(city, df[df['city'] == city].copy()) for city in cities]
+
+    results = {}
+    for result in executor.map(_analyze_city_wrapper, city_data_list):
+        results[result['city']] = result
+
+    return results
+
+
+def _create_executor(backend, max_workers):
+    if backend == 'processes':
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+    return ThreadPoolExecutor(max_workers=max_workers)
+
+
+def analyze_parallel(df, max_workers=None, backend='threads'):
     if max_workers is None:
         max_workers = multiprocessing.cpu_count()
 
     start_time = time.time()
 
-    cities = df['city'].unique()
-    city_data_list = [(city, df[df['city'] == city].copy()) for city in cities]
+    with _create_executor(backend, max_workers) as executor:
+        results = _analyze_with_executor(df, executor)
 
-    results = {}
+    execution_time = time.time() - start_time
+    return results, execution_time
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = list(executor.map(_analyze_city_wrapper, city_data_list))
 
-    for result in futures:
-        results[result['city']] = result
+def analyze_vectorized(df, window=30):
+    start_time = time.time()
+
+    df = df.sort_values(['city', 'timestamp']).reset_index(drop=True)
+    by_city = df.groupby('city', observed=True, sort=False)
+
+    rolling = by_city['temperature'].rolling(window, center=True)
+    df['rolling_mean'] = rolling.mean().reset_index(level=0, drop=True)
+    df['rolling_std'] = rolling.std().reset_index(level=0, drop=True)
+
+    seasonal = df.groupby(['city', 'season'], observed=True)['temperature'].agg(
+        ['mean', 'std', 'min', 'max', 'count']
+    ).reset_index()
+
+    bounds = seasonal[['city', 'season', 'mean', 'std']].rename(
+        columns={'mean': 'season_mean', 'std': 'season_std'}
+    )
+    df = df.merge(bounds, on=['city', 'season'], how='left', sort=False)
+    df['season_lower'] = df['season_mean'] - 2 * df['season_std']
+    df['season_upper'] = df['season_mean'] + 2 * df['season_std']
+    df['is_anomaly'] = (df['temperature'] < df['season_lower']) | (df['temperature'] > df['season_upper'])
+    df = df.drop(columns='season_std')
+
+    days = (df['timestamp'] - by_city['timestamp'].transform('min')).dt.days.astype(np.float64)
+    temperature = df['temperature']
+    sums = pd.DataFrame({
+        'city': df['city'],
+        'n': 1.0,
+        'x': days,
+        'y': temperature,
+        'xx': days * days,
+        'xy': days * temperature,
+        'yy': temperature * temperature
+    }).groupby('city', observed=True).sum()
+
+    sxx = sums['n'] * sums['xx'] - sums['x'] ** 2
+    sxy = sums['n'] * sums['xy'] - sums['x'] * sums['y']
+    syy = sums['n'] * sums['yy'] - sums['y'] ** 2
+    slopes = sxy / sxx
+    intercepts = (sums['y'] - slopes * sums['x']) / sums['n']
+    r_values = sxy / np.sqrt(sxx * syy)
+
+    yearly = df.assign(year=df['timestamp'].dt.year).groupby(
+        ['city', 'year'], observed=True
+    )['temperature'].agg(['mean', 'std', 'min', 'max']).reset_index()
+
+    seasonal_by_city = dict(tuple(seasonal.groupby('city', observed=True)))
+    yearly_by_city = dict(tuple(yearly.groupby('city', observed=True)))
+
+    results = {}
+    for city, city_data in df.groupby('city', observed=True, sort=False):
+        anomaly_count = city_data['is_anomaly'].sum()
+        results[city] = {
+            'city': city,
+            'data': city_data,
+            'seasonal_stats': seasonal_by_city[city].drop(columns='city').reset_index(drop=True),
+            'yearly_stats': yearly_by_city[city].drop(columns='city').reset_index(drop=True),
+            'trend_slope': slopes[city],
+            'trend_slope_yearly': slopes[city] * 365,
+            'trend_intercept': intercepts[city],
+            'trend_r_value': r_values[city],
+            'anomaly_count': anomaly_count,
+            'anomaly_percent': (anomaly_count / len(city_data)) * 100
+        }
 
     execution_time = time.time() - start_time
     return results, execution_time
@@ -178,6 +260,114 @@ def benchmark_analysis(df, runs=3):
     }
 
 
+def generate_synthetic_data(n_cities, n_days, seed=42):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2000-01-01', periods=n_days, freq='D')
+
+    month_to_season = {12: 'winter', 1: 'winter', 2: 'winter',
+                       3: 'spring', 4: 'spring', 5: 'spring',
+                       6: 'summer', 7: 'summer', 8: 'summer',
+                       9: 'autumn', 10: 'autumn', 11: 'autumn'}
+    seasons = dates.month.map(month_to_season).to_numpy()
+    phase = 2 * np.pi * dates.dayofyear.to_numpy() / 365.25
+
+    base = rng.uniform(-5, 25, n_cities)
+    amplitude = rng.uniform(3, 15, n_cities)
+    temperature = (
+        base[:, None]
+        - amplitude[:, None] * np.cos(phase)[None, :]
+        + rng.normal(0, 5, (n_cities, n_days))
+    )
+
+    return pd.DataFrame({
+        'city': np.repeat([f"City {i + 1}" for i in range(n_cities)], n_days),
+        'timestamp': np.tile(dates.values, n_cities),
+        'temperature': temperature.ravel(),
+        'season': np.tile(seasons, n_cities)
+    })
+
+
+def fit_amdahl(workers, speedups):
+    n = np.asarray(workers, dtype=np.float64)
+    speedup = np.asarray(speedups, dtype=np.float64)
+
+    mask = (n > 1) & (speedup > 0)
+    if not mask.any():
+        return None
+
+    # 1/S = s + (1 - s)/n  =>  1/S - 1/n = s * (1 - 1/n)
+    a = 1 / speedup[mask] - 1 / n[mask]
+    b = 1 - 1 / n[mask]
+    serial_fraction = float(np.clip(np.sum(a * b) / np.sum(b * b), 0.0, 1.0))
+
+    return {
+        'serial_fraction': serial_fraction,
+        'max_speedup': 1 / serial_fraction if serial_fraction > 0 else np.inf
+    }
+
+
+def _noop(_):
+    return None
+
+
+def benchmark_scaling(sizes, worker_counts, backends=('serial', 'threads', 'processes', 'vectorized'), runs=1):
+    rows = []
+
+    for n_cities, n_days in sizes:
+        df = generate_synthetic_data(n_cities, n_days)
+        size_label = f"{n_cities} x {n_days}"
+
+        serial_time = np.mean([analyze_sequential(df)[1] for _ in range(runs)])
+
+        def add_row(backend, workers, seconds):
+            speedup = serial_time / seconds if seconds > 0 else 0
+            rows.append({
+                'size': size_label,
+                'rows': len(df),
+                'backend': backend,
+                'workers': workers,
+                'seconds': seconds,
+                'speedup': speedup,
+                'efficiency': speedup / workers
+            })
+
+        if 'serial' in backends:
+            add_row('serial', 1, serial_time)
+
+        if 'vectorized' in backends:
+            add_row('vectorized', 1, np.mean([analyze_vectorized(df)[1] for _ in range(runs)]))
+
+        for backend in ('threads', 'processes'):
+            if backend not in backends:
+                continue
+
+            for workers in worker_counts:
+                with _create_executor(backend, workers) as executor:
+                    list(executor.map(_noop, range(workers)))
+
+                    times = []
+                    for _ in range(runs):
+                        start_time = time.time()
+                        _analyze_with_executor(df, executor)
+                        times.append(time.time() - start_time)
+
+                add_row(backend, workers, np.mean(times))
+
+    results = pd.DataFrame(rows)
+
+    fits = []
+    for (size_label, backend), group in results.groupby(['size', 'backend'], sort=False):
+        if backend not in ('threads', 'processes'):
+            continue
+        single = group.loc[group['workers'] == 1, 'seconds']
+        base_time = single.iloc[0] if not single.empty else group['seconds'].iloc[0] * group['speedup'].iloc[0]
+        fit = fit_amdahl(group['workers'], base_time / group['seconds'])
+        if fit is not None:
+            fits.append({'size': size_label, 'backend': backend, **fit})
+
+    return results, pd.DataFrame(fits, columns=['size', 'backend', 'serial_fraction', 'max_speedup'])
+
+
 def get_current_season():
     month = datetime.now().month
     if month in [12, 1, 2]:
@@ -212,8 +402,38 @@ def check_temperature_anomaly(current_temp, seasonal_stats, season):
     return status, lower_bound, upper_bound
 
 
+def calculate_seasonal_bounds(df):
+    bounds = df.groupby(['city', 'season'], observed=True)['temperature'].agg(['mean', 'std']).reset_index()
+    bounds['city'] = bounds['city'].astype(str)
+    bounds['season'] = bounds['season'].astype(str)
+    bounds['lower'] = bounds['mean'] - 2 * bounds['std']
+    bounds['upper'] = bounds['mean'] + 2 * bounds['std']
+    return bounds
+
+
+def classify_readings(readings, seasonal_bounds, season):
+    season_bounds = seasonal_bounds[seasonal_bounds['season'] == season]
+    result = readings.merge(
+        season_bounds[['city', 'mean', 'lower', 'upper']],
+        on='city',
+        how='left'
+    )
+
+    temperature = result['temperature'].to_numpy(dtype=np.float64)
+    lower = result['lower'].to_numpy(dtype=np.float64)
+    upper = result['upper'].to_numpy(dtype=np.float64)
+
+    result['status'] = np.select(
+        [np.isnan(temperature) | np.isnan(lower), temperature < lower, temperature > upper],
+        ['unknown', 'cold_anomaly', 'hot_anomaly'],
+        default='normal'
+    )
+    result['deviation'] = temperature - result['mean'].to_numpy(dtype=np.float64)
+    return result
+
+
 def get_descriptive_stats(df):
-    stats_df = df.groupby('season')['temperature'].describe()
+    stats_df = df.groupby('season', observed=True)['temperature'].describe()
     stats_df = stats_df.round(2)
     return stats_df
 
@@ -268,7 +488,7 @@ def calculate_city_correlations(df):
 
 
 def cluster_cities_by_temperature(df):
-    city_stats = df.groupby('city')['temperature'].agg(['mean', 'std']).reset_index()
+    city_stats = df.groupby('city', observed=True)['temperature'].agg(['mean', 'std']).reset_index()
 
     cities = city_stats['city'].tolist()
     means = city_stats['mean'].tolist()
@@ -282,6 +502,97 @@ def cluster_cities_by_temperature(df):
     }
 
 
+def points_for_width(width_px, points_per_pixel=2):
+    return max(3, int(width_px * points_per_pixel))
+
+
+def lttb_indices(x, y, n_out):
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+
+        next_y = y[end:next_end]
+        avg_x = x[end:next_end].mean()
+        avg_y = np.nanmean(next_y) if not np.isnan(next_y).all() else y[a]
+
+        xs = x[start:end]
+        ys = y[start:end]
+        area = np.abs((x[a] - avg_x) * (ys - y[a]) - (x[a] - xs) * (avg_y - y[a]))
+        area = np.where(np.isnan(area), -1.0, area)
+
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
+
+
+def minmax_indices(y, n_out):
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+
+    n_buckets = n_out // 2
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)
+    filled = np.where(np.isnan(y), np.inf, y)
+    lows = [start + int(np.argmin(filled[start:end])) for start, end in zip(edges[:-1], edges[1:])]
+    filled = np.where(np.isnan(y), -np.inf, y)
+    highs = [start + int(np.argmax(filled[start:end])) for start, end in zip(edges[:-1], edges[1:])]
+
+    return np.unique(np.concatenate([lows, highs, [0, n - 1]]))
+
+
+def extreme_indices(y, mask, n_buckets):
+    y = np.asarray(y, dtype=np.float64)
+    candidates = np.flatnonzero(np.asarray(mask, dtype=bool))
+    if len(candidates) <= n_buckets:
+        return candidates
+
+    edges = np.linspace(0, len(y), n_buckets + 1).astype(np.int64)
+    filled = np.nan_to_num(y)
+    means = np.add.reduceat(filled, edges[:-1]) / np.diff(edges)
+
+    buckets = np.searchsorted(edges, candidates, side='right') - 1
+    deviation = np.abs(filled[candidates] - means[buckets])
+    order = np.lexsort((-deviation, buckets))
+    _, first = np.unique(buckets[order], return_index=True)
+    return np.sort(candidates[order][first])
+
+
+def decimate_series(df, x_col, y_col, max_points, keep_mask=None, method='lttb'):
+    if len(df) <= max_points:
+        return df
+
+    x = df[x_col]
+    if pd.api.types.is_datetime64_any_dtype(x):
+        x = x.values.astype('datetime64[ns]').astype(np.int64)
+    y = df[y_col].values
+
+    if method == 'minmax':
+        indices = minmax_indices(y, max_points)
+    else:
+        indices = lttb_indices(x, y, max_points)
+
+    if keep_mask is not None:
+        indices = np.union1d(indices, extreme_indices(y, keep_mask, max_points))
+
+    return df.iloc[indices]
+
+
 if __name__ == "__main__":
     import os
 
@@ -11,12 +11,22 @@ from analysis import (
     load_data, analyze_city, analyze_sequential, analyze_parallel,
     benchmark_analysis, get_current_season, check_temperature_anomaly,
     get_descriptive_stats, calculate_seasonal_stats, predict_temperature,
-    calculate_city_correlations, cluster_cities_by_temperature
+    calculate_city_correlations, cluster_cities_by_temperature,
+    decimate_series, extreme_indices, points_for_width, benchmark_scaling
 )
+from data_cache import (
+    fingerprint_bytes, fingerprint_file, load_dataset, get_city_data,
+    get_city_analysis, get_prediction, get_correlations, get_clusters,
+    start_precomputation, get_seasonal_bounds, get_shared_store
+)
+from monitor import WeatherMonitor
+from ingest import DataValidationError
 from weather_api import (
     get_current_weather_sync, validate_api_key,
     InvalidAPIKeyError, WeatherAPIError,
-    get_weather_multiple_cities_sync, run_async_weather, benchmark_api_methods
+    get_weather_multiple_cities_sync, run_async_weather, benchmark_api_methods,
+    stream_weather_multiple_cities, get_request_coalescing_stats,
+    WeatherClient, HedgePolicy, CircuitBreaker
 )
 
 st.set_page_config(
@@ -29,7 +39,18 @@ st.title("Анализ температурных данных")
 
 with st.sidebar:
     st.header("Навигация")
-    page = st.radio("Выберите страницу", ["Анализ данных", "API Погода"])
+    page = st.radio("Выберите страницу", ["Анализ данных", "API Погода", "Масштабируемость"])
+
+    st.header("Графики")
+
+    chart_width = st.number_input(
+        "Ширина графика (px)",
+        min_value=300,
+        max_value=4000,
+        value=1200,
+        step=100,
+        help="Число точек на графиках ограничивается шириной, длинные ряды прореживаются"
+    )
 
     st.header("Загрузка данных")
 
@@ -62,20 +83,52 @@ with st.sidebar:
                 else:
                     st.error(message)
 
-def load_cached_data(file_content=None, file_path=None):
-    if file_content is not None:
-        return pd.read_csv(file_content)
-    elif file_path and os.path.exists(file_path):
-        return load_data(file_path)
-    return None
+@st.cache_resource(max_entries=4)
+def get_weather_monitor(api_key, dataset_key, _cities, _seasonal_bounds):
+    return WeatherMonitor(
+        _cities,
+        api_key,
+        _seasonal_bounds,
+        client=get_weather_client(api_key, True, True)
+    )
+
+WEBGL_THRESHOLD = 5000
+
+def lazy_section(name, label):
+    state_key = f"lazy_{name}_{dataset_key}"
+    if st.session_state.get(state_key):
+        return True
+    if st.button(label, key=f"button_{state_key}"):
+        st.session_state[state_key] = True
+        return True
+    return False
+
+def line_trace(x, y, **kwargs):
+    trace_cls = go.Scattergl if len(x) > WEBGL_THRESHOLD else go.Scatter
+    return trace_cls(x=x, y=y, **kwargs)
+
+@st.cache_resource(max_entries=8)
+def get_weather_client(api_key, use_hedging, use_breaker):
+    return WeatherClient(
+        api_key,
+        hedge=HedgePolicy() if use_hedging else None,
+        breaker=CircuitBreaker() if use_breaker else None
+    )
 
 df = None
-if uploaded_file is not None:
-    df = load_cached_data(file_content=uploaded_file)
-    assert df is not None
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-elif use_default and os.path.exists(default_file_path):
-    df = load_cached_data(file_path=default_file_path)
+dataset_key = None
+ingest_report = None
+try:
+    if uploaded_file is not None:
+        file_bytes = uploaded_file.getvalue()
+        dataset_key = fingerprint_bytes(file_bytes)
+        df, ingest_report = load_dataset(dataset_key, file_bytes)
+    elif use_default and os.path.exists(default_file_path):
+        dataset_key = fingerprint_file(default_file_path)
+        df, ingest_report = load_dataset(dataset_key, default_file_path)
+except DataValidationError as e:
+    st.error(f"Файл не прошёл проверку: {e}")
+    st.stop()
 
 if df is None:
     st.warning("Пж, загрузите CSV файл.")
@@ -84,6 +137,55 @@ if df is None:
 assert df is not None
 cities = sorted(df['city'].unique().tolist())
 
+precomputation = start_precomputation(dataset_key, df)
+
+def show_precomputation_progress():
+    done, total = precomputation.progress()
+    if done < total:
+        st.progress(done / total, text=f"Анализ городов: {done}/{total}")
+    else:
+        st.caption(f"Все города проанализированы ({total})")
+
+with st.sidebar:
+    st.caption(
+        f"Загружено {ingest_report['rows']} строк за {ingest_report['seconds']:.2f} сек "
+        f"({ingest_report['rows_per_second'] / 1000:.0f} тыс. строк/сек), "
+        f"в памяти {ingest_report['memory_mb']:.1f} МБ"
+    )
+    st.fragment(run_every=None if precomputation.is_done() else 1)(show_precomputation_progress)()
+
+    with st.expander("Память сервера"):
+        shared_store = get_shared_store()
+        store_stats = shared_store.stats()
+
+        st.progress(
+            min(1.0, store_stats['total_bytes'] / store_stats['max_bytes']),
+            text=f"{store_stats['total_bytes'] / 2**20:.1f} из {store_stats['max_bytes'] / 2**20:.0f} МБ"
+        )
+        st.caption(
+            f"Записей: {store_stats['entries']}, попаданий: {store_stats['hits']}, "
+            f"промахов: {store_stats['misses']}, вытеснено: {store_stats['evictions']}"
+        )
+
+        usage = shared_store.usage()
+        if not usage.empty:
+            usage = usage.groupby('kind', as_index=False)['bytes'].sum()
+            usage['МБ'] = (usage['bytes'] / 2**20).round(2)
+            st.dataframe(usage[['kind', 'МБ']], width='stretch', hide_index=True)
+
+        st.number_input(
+            "Лимит памяти (МБ)",
+            min_value=64,
+            max_value=65536,
+            value=int(store_stats['max_bytes'] / 2**20),
+            step=64,
+            key="store_max_mb",
+            on_change=lambda: shared_store.set_max_bytes(st.session_state['store_max_mb'] * 2**20)
+        )
+
+        if st.button("Очистить кэш", key="clear_shared_store"):
+            shared_store.clear()
+
 if page == "Анализ данных":
     col1, col2 = st.columns([2, 1])
     with col1:
@@ -93,10 +195,10 @@ if page == "Анализ данных":
             index=0
         )
 
-    city_data = df[df['city'] == selected_city].copy()
+    city_data = get_city_data(dataset_key, selected_city, df)
 
     with st.spinner(f"Анализ данных для {selected_city}..."):
-        analysis_result = analyze_city(city_data)
+        analysis_result = get_city_analysis(dataset_key, selected_city, df)
 
     tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
         "Описательная статистика",
@@ -147,27 +249,34 @@ if page == "Анализ данных":
         st.header(f"Временной ряд температур: {selected_city}")
 
         data = analysis_result['data']
+        max_points = points_for_width(chart_width)
+
+        temperature_points = decimate_series(
+            data, 'timestamp', 'temperature', max_points, keep_mask=data['is_anomaly']
+        )
+        mean_points = decimate_series(data, 'timestamp', 'rolling_mean', max_points, method='minmax')
 
         fig_ts = go.Figure()
 
-        fig_ts.add_trace(go.Scatter(
-            x=data['timestamp'],
-            y=data['temperature'],
+        fig_ts.add_trace(line_trace(
+            temperature_points['timestamp'],
+            temperature_points['temperature'],
             mode='lines',
             name='Температура'
         ))
 
-        fig_ts.add_trace(go.Scatter(
-            x=data['timestamp'],
-            y=data['rolling_mean'],
+        fig_ts.add_trace(line_trace(
+            mean_points['timestamp'],
+            mean_points['rolling_mean'],
             mode='lines',
             name='Среднее'
         ))
 
         anomalies = data[data['is_anomaly'] == True]
-        fig_ts.add_trace(go.Scatter(
-            x=anomalies['timestamp'],
-            y=anomalies['temperature'],
+        anomaly_points = data.iloc[extreme_indices(data['temperature'], data['is_anomaly'], max_points)]
+        fig_ts.add_trace(line_trace(
+            anomaly_points['timestamp'],
+            anomaly_points['temperature'],
             mode='markers',
             name='Аномалии',
             marker=dict(color='red')
@@ -255,18 +364,24 @@ if page == "Анализ данных":
             analysis_result['trend_slope'] * data_with_analysis['days']
         )
 
+        trend_points = decimate_series(
+            data_with_analysis, 'timestamp', 'temperature', points_for_width(chart_width),
+            keep_mask=data_with_analysis['is_anomaly']
+        )
+        trend_line = data_with_analysis.iloc[[0, -1]]
+
         fig_trend = go.Figure()
 
-        fig_trend.add_trace(go.Scatter(
-            x=data_with_analysis['timestamp'],
-            y=data_with_analysis['temperature'],
+        fig_trend.add_trace(line_trace(
+            trend_points['timestamp'],
+            trend_points['temperature'],
             mode='lines',
             name='Температура'
         ))
 
         fig_trend.add_trace(go.Scatter(
-            x=data_with_analysis['timestamp'],
-            y=data_with_analysis['trend'],
+            x=trend_line['timestamp'],
+            y=trend_line['trend'],
             mode='lines',
             name='Тренд',
             line=dict(color='red', dash='dash')
@@ -293,80 +408,90 @@ if page == "Анализ данных":
 
         st.subheader("Прогноз температуры")
 
-        ml_result = predict_temperature(city_data, days_ahead=365)
-
-        col1, col2 = st.columns(2)
-        with col1:
-            st.metric("RMSE", f"{ml_result['rmse']}C")
-        with col2:
-            st.metric("R2", f"{ml_result['r2']}")
-
-        city_data_sorted = city_data.sort_values('timestamp').copy()
-        city_data_sorted['prediction'] = ml_result['predictions']
-
-        fig_ml = go.Figure()
-
-        fig_ml.add_trace(go.Scatter(
-            x=city_data_sorted['timestamp'],
-            y=city_data_sorted['temperature'],
-            mode='lines',
-            name='Данные'
-        ))
-
-        fig_ml.add_trace(go.Scatter(
-            x=city_data_sorted['timestamp'],
-            y=city_data_sorted['prediction'],
-            mode='lines',
-            name='Модель'
-        ))
-
-        fig_ml.add_trace(go.Scatter(
-            x=ml_result['future_dates'],
-            y=ml_result['future_predictions'],
-            mode='lines',
-            name='Прогноз',
-            line=dict(dash='dash')
-        ))
-
-        fig_ml.update_layout(title="Прогноз температуры")
-        st.plotly_chart(fig_ml, width='stretch')
+        if lazy_section("forecast", "Построить прогноз"):
+            ml_result = get_prediction(dataset_key, selected_city, 365, df)
+
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("RMSE", f"{ml_result['rmse']}C")
+            with col2:
+                st.metric("R2", f"{ml_result['r2']}")
+
+            city_data_sorted = city_data.sort_values('timestamp').copy()
+            city_data_sorted['prediction'] = ml_result['predictions']
+
+            max_points = points_for_width(chart_width)
+            observed_points = decimate_series(city_data_sorted, 'timestamp', 'temperature', max_points)
+            model_points = decimate_series(city_data_sorted, 'timestamp', 'prediction', max_points)
+            forecast = pd.DataFrame({
+                'timestamp': ml_result['future_dates'],
+                'prediction': ml_result['future_predictions']
+            })
+            forecast_points = decimate_series(forecast, 'timestamp', 'prediction', max_points)
+
+            fig_ml = go.Figure()
+
+            fig_ml.add_trace(line_trace(
+                observed_points['timestamp'],
+                observed_points['temperature'],
+                mode='lines',
+                name='Данные'
+            ))
+
+            fig_ml.add_trace(line_trace(
+                model_points['timestamp'],
+                model_points['prediction'],
+                mode='lines',
+                name='Модель'
+            ))
+
+            fig_ml.add_trace(line_trace(
+                forecast_points['timestamp'],
+                forecast_points['prediction'],
+                mode='lines',
+                name='Прогноз',
+                line=dict(dash='dash')
+            ))
+
+            fig_ml.update_layout(title="Прогноз температуры")
+            st.plotly_chart(fig_ml, width='stretch')
 
-         
         st.subheader("Корреляции")
 
-        corr_matrix = calculate_city_correlations(df)
+        if lazy_section("correlations", "Рассчитать корреляции"):
+            corr_matrix = get_correlations(dataset_key, df)
 
-        fig_corr = go.Figure(data=go.Heatmap(
-            z=corr_matrix.values,
-            x=corr_matrix.columns,
-            y=corr_matrix.index,
-            colorscale='RdBu'
-        ))
+            fig_corr = go.Figure(data=go.Heatmap(
+                z=corr_matrix.values,
+                x=corr_matrix.columns,
+                y=corr_matrix.index,
+                colorscale='RdBu'
+            ))
 
-        fig_corr.update_layout(title="Корреляция между городами")
-        st.plotly_chart(fig_corr, width='stretch')
+            fig_corr.update_layout(title="Корреляция между городами")
+            st.plotly_chart(fig_corr, width='stretch')
 
-         
         st.subheader("Кластеризация городов")
 
-        cluster_data = cluster_cities_by_temperature(df)
-
-        fig_cluster = go.Figure()
-        fig_cluster.add_trace(go.Scatter(
-            x=cluster_data['mean_temps'],
-            y=cluster_data['std_temps'],
-            mode='markers+text',
-            text=cluster_data['cities'],
-            textposition='top center'
-        ))
-
-        fig_cluster.update_layout(
-            title="Города по температуре",
-            xaxis_title="Средняя T",
-            yaxis_title="Ст. откл."
-        )
+        if lazy_section("clusters", "Кластеризовать города"):
+            cluster_data = get_clusters(dataset_key, df)
+
+            fig_cluster = go.Figure()
+            fig_cluster.add_trace(go.Scatter(
+                x=cluster_data['mean_temps'],
+                y=cluster_data['std_temps'],
+                mode='markers+text',
+                text=cluster_data['cities'],
+                textposition='top center'
+            ))
+
+            fig_cluster.update_layout(
+                title="Города по температуре",
+                xaxis_title="Средняя T",
+                yaxis_title="Ст. откл."
+            )
 
-        st.plotly_chart(fig_cluster, width='stretch')
+            st.plotly_chart(fig_cluster, width='stretch')
 
     with tab6:
         st.header("Бэнчамарки: Сравнение методов")
@@ -445,10 +570,10 @@ elif page == "API Погода":
         index=0
     )
 
-    city_data = df[df['city'] == selected_city].copy()
+    city_data = get_city_data(dataset_key, selected_city, df)
 
     with st.spinner(f"Анализ данных для {selected_city}..."):
-        analysis_result = analyze_city(city_data)
+        analysis_result = get_city_analysis(dataset_key, selected_city, df)
 
     if not api_key:
         st.info("Введите API ключ OpenWeatherMap в боковой панели для получения текущей погоды.")
@@ -527,3 +652,182 @@ elif page == "API Погода":
                     st.error(f"Ошибка API: {str(e)}")
                 except Exception as e:
                     st.error(f"Ошибка: {str(e)}")
+
+        st.subheader("Погода во всех городах")
+
+        deadline = st.slider("Максимальное время ожидания (сек)", 1, 30, 10)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            use_hedging = st.checkbox("Дублировать медленные запросы (p95)", value=True)
+        with col2:
+            use_breaker = st.checkbox("Circuit breaker", value=True)
+
+        weather_client = get_weather_client(api_key, use_hedging, use_breaker)
+
+        if st.button("Получить погоду для всех городов", key="get_weather_all"):
+            progress = st.progress(0.0)
+            table = st.empty()
+            rows = []
+
+            for weather in stream_weather_multiple_cities(cities, api_key, deadline=deadline,
+                                                          client=weather_client):
+                rows.append(weather)
+                progress.progress(len(rows) / len(cities))
+                table.dataframe(pd.DataFrame(rows), width='stretch')
+
+            failed = [row for row in rows if 'error' in row]
+            if failed:
+                st.warning(f"Не удалось получить данные для {len(failed)} из {len(cities)} городов")
+
+            flight_stats = get_request_coalescing_stats()
+            st.caption(
+                f"Объединено одинаковых запросов: {flight_stats['coalesced']} "
+                f"из {flight_stats['requests']} ({flight_stats['coalesced_percent']:.1f}%)"
+            )
+
+        with st.expander("Статистика клиента API"):
+            st.json(weather_client.stats())
+
+        st.subheader("Мониторинг аномалий")
+
+        monitor_enabled = st.toggle("Включить мониторинг всех городов", key="monitor_enabled")
+
+        if monitor_enabled:
+            monitor_interval = st.slider("Интервал опроса (сек)", 10, 600, 60, key="monitor_interval")
+            monitor = get_weather_monitor(
+                api_key, dataset_key, cities, get_seasonal_bounds(dataset_key, df)
+            )
+
+            @st.fragment(run_every=2)
+            def show_monitor():
+                if monitor.is_due(monitor_interval):
+                    monitor.start_poll(deadline=min(monitor_interval, 30))
+
+                readings = monitor.latest()
+                anomalies = readings[readings['status'].isin(['cold_anomaly', 'hot_anomaly'])]
+
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Городов с данными", f"{len(readings)}/{len(cities)}")
+                with col2:
+                    st.metric("Аномалий", len(anomalies))
+                with col3:
+                    st.metric("Опросов", monitor.polls)
+
+                if monitor.is_polling():
+                    st.caption("Идёт опрос...")
+
+                st.write("**Аномалии**")
+                anomalies_display = anomalies[['city', 'polled_at', 'temperature', 'lower', 'upper', 'status']].copy()
+                anomalies_display.columns = ['Город', 'Время', 'Температура', 'Нижняя граница', 'Верхняя граница', 'Статус']
+                st.dataframe(anomalies_display.round(2), width='stretch')
+
+                with st.expander("Все текущие показания"):
+                    st.dataframe(readings.round(2), width='stretch')
+
+                errors = monitor.errors()
+                if not errors.empty:
+                    with st.expander(f"Ошибки ({len(errors)})"):
+                        st.dataframe(errors, width='stretch')
+
+                history = monitor.history()
+                history = history[history['error'].isna()]
+                if not history.empty:
+                    fig_history = px.line(
+                        history,
+                        x='polled_at',
+                        y='temperature',
+                        color='city',
+                        markers=True,
+                        title="История показаний"
+                    )
+                    st.plotly_chart(fig_history, width='stretch')
+
+            show_monitor()
+
+elif page == "Масштабируемость":
+    st.header("Масштабируемость анализа")
+
+    st.write(
+        "Анализ синтетических данных разного объёма последовательно, в потоках, "
+        "в процессах и векторизованно. Ускорение считается относительно "
+        "последовательного варианта, доля последовательной части оценивается по закону Амдала."
+    )
+
+    cpu_count = os.cpu_count() or 1
+    size_options = {
+        "10 городов x 1 год": (10, 365),
+        "20 городов x 5 лет": (20, 5 * 365),
+        "50 городов x 10 лет": (50, 10 * 365),
+        "100 городов x 20 лет": (100, 20 * 365)
+    }
+
+    col1, col2 = st.columns(2)
+    with col1:
+        max_workers = st.slider("Максимум воркеров", 1, max(2, cpu_count * 2), cpu_count)
+        backends = st.multiselect(
+            "Бэкенды",
+            ['serial', 'threads', 'processes', 'vectorized'],
+            default=['serial', 'threads', 'processes', 'vectorized']
+        )
+    with col2:
+        selected_sizes = st.multiselect(
+            "Объёмы данных",
+            list(size_options),
+            default=list(size_options)[:2]
+        )
+        runs = st.number_input("Повторов", min_value=1, max_value=5, value=1)
+
+    if st.button("Запустить", key="bench_scaling") and selected_sizes and backends:
+        with st.spinner("Выполнение бенчмарка (может занять несколько минут)..."):
+            st.session_state['scaling_benchmark'] = benchmark_scaling(
+                [size_options[label] for label in selected_sizes],
+                list(range(1, max_workers + 1)),
+                backends=backends,
+                runs=int(runs)
+            )
+
+    if 'scaling_benchmark' in st.session_state:
+        scaling_results, amdahl_fits = st.session_state['scaling_benchmark']
+
+        fig_speedup = px.line(
+            scaling_results,
+            x='workers',
+            y='speedup',
+            color='backend',
+            line_dash='size',
+            markers=True,
+            title="Ускорение относительно последовательного анализа"
+        )
+        worker_axis = sorted(scaling_results['workers'].unique())
+        fig_speedup.add_trace(go.Scatter(
+            x=worker_axis,
+            y=worker_axis,
+            mode='lines',
+            name='Идеальное',
+            line=dict(color='gray', dash='dot')
+        ))
+        st.plotly_chart(fig_speedup, width='stretch')
+
+        fig_efficiency = px.line(
+            scaling_results,
+            x='workers',
+            y='efficiency',
+            color='backend',
+            line_dash='size',
+            markers=True,
+            title="Эффективность (ускорение / число воркеров)"
+        )
+        st.plotly_chart(fig_efficiency, width='stretch')
+
+        st.subheader("Оценка по закону Амдала")
+        if amdahl_fits.empty:
+            st.info("Для оценки нужно хотя бы два значения числа воркеров")
+        else:
+            fits_display = amdahl_fits.copy()
+            fits_display.columns = ['Объём', 'Бэкенд', 'Последовательная доля', 'Предельное ускорение']
+            st.dataframe(fits_display.round(3), width='stretch')
+
+        st.subheader("Результаты")
+        st.dataframe(scaling_results.round(4), width='stretch')
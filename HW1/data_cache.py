@@ -0,0 +1,247 @@
+import hashlib
+import multiprocessing
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from ingest import ingest_csv
+from analysis import (
+    analyze_city, predict_temperature,
+    calculate_city_correlations, cluster_cities_by_temperature,
+    calculate_seasonal_bounds
+)
+
+STORE_MAX_MB = int(os.getenv("HW1_STORE_MAX_MB", "1024"))
+
+
+def fingerprint_bytes(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def fingerprint_file(file_path):
+    stat = os.stat(file_path)
+    return f"{os.path.abspath(file_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def estimate_size(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class SharedStore:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        try:
+            with key_lock:
+                value = self.get(key)
+                if value is not None:
+                    return value
+
+                with self._lock:
+                    self.misses += 1
+
+                value = compute()
+                self.put(key, value)
+        finally:
+            with self._lock:
+                self._key_locks.pop(key, None)
+
+        return value
+
+    def put(self, key, value):
+        nbytes = estimate_size(value)
+
+        with self._lock:
+            if key in self._items:
+                self.total_bytes -= self._items.pop(key)[1]
+
+            self._items[key] = (value, nbytes)
+            self.total_bytes += nbytes
+            self._evict()
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and len(self._items) > 1:
+            _, (_, nbytes) = self._items.popitem(last=False)
+            self.total_bytes -= nbytes
+            self.evictions += 1
+
+    def set_max_bytes(self, max_bytes):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'entries': len(self._items),
+                'total_bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / requests if requests else 0.0
+            }
+
+    def usage(self):
+        with self._lock:
+            rows = [(key[0], key[1], nbytes) for key, (_, nbytes) in self._items.items()]
+        return pd.DataFrame(rows, columns=['kind', 'dataset', 'bytes'])
+
+
+@st.cache_resource
+def get_shared_store():
+    return SharedStore(STORE_MAX_MB * 2**20)
+
+
+def load_dataset(fingerprint, source):
+    return get_shared_store().get_or_compute(
+        ('dataset', fingerprint),
+        lambda: ingest_csv(source)
+    )
+
+
+def slice_city(store, fingerprint, city, df):
+    return store.get_or_compute(
+        ('city_data', fingerprint, city),
+        lambda: df[df['city'] == city]
+    )
+
+
+def get_city_data(fingerprint, city, df):
+    return slice_city(get_shared_store(), fingerprint, city, df)
+
+
+class CityPrecomputation:
+    def __init__(self, fingerprint, cities, store, max_workers=None):
+        if max_workers is None:
+            max_workers = multiprocessing.cpu_count()
+
+        self.fingerprint = fingerprint
+        self._store = store
+        self._lock = threading.Lock()
+        self._done = set()
+        self.cities = list(cities)
+
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="city-analysis")
+        self._futures = {city: executor.submit(self._analyze, city) for city in self.cities}
+        executor.shutdown(wait=False)
+
+    def _analyze(self, city, df=None):
+        try:
+            if df is None:
+                dataset = self._store.get(('dataset', self.fingerprint))
+                if dataset is None:
+                    return None
+                df = dataset[0]
+
+            return self._store.get_or_compute(
+                ('analysis', self.fingerprint, city),
+                lambda: analyze_city(slice_city(self._store, self.fingerprint, city, df))
+            )
+        finally:
+            with self._lock:
+                self._done.add(city)
+
+    def get(self, city, df):
+        result = self._store.get(('analysis', self.fingerprint, city))
+        if result is not None:
+            return result
+
+        future = self._futures.get(city)
+        if future is not None and not future.done() and not future.cancel():
+            result = future.result()
+        if result is None:
+            result = self._analyze(city, df)
+        return result
+
+    def progress(self):
+        with self._lock:
+            return len(self._done), len(self.cities)
+
+    def is_done(self):
+        done, total = self.progress()
+        return done == total
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def start_precomputation(fingerprint, _df):
+    return CityPrecomputation(fingerprint, sorted(_df['city'].unique().tolist()), get_shared_store())
+
+
+def get_city_analysis(fingerprint, city, df):
+    return start_precomputation(fingerprint, df).get(city, df)
+
+
+def get_prediction(fingerprint, city, days_ahead, df):
+    return get_shared_store().get_or_compute(
+        ('prediction', fingerprint, city, days_ahead),
+        lambda: predict_temperature(get_city_data(fingerprint, city, df), days_ahead=days_ahead)
+    )
+
+
+def get_correlations(fingerprint, df):
+    return get_shared_store().get_or_compute(
+        ('correlations', fingerprint),
+        lambda: calculate_city_correlations(df)
+    )
+
+
+def get_clusters(fingerprint, df):
+    return get_shared_store().get_or_compute(
+        ('clusters', fingerprint),
+        lambda: cluster_cities_by_temperature(df)
+    )
+
+
+def get_seasonal_bounds(fingerprint, df):
+    return get_shared_store().get_or_compute(
+        ('seasonal_bounds', fingerprint),
+        lambda: calculate_seasonal_bounds(df)
+    )
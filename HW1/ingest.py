@@ -0,0 +1,124 @@
+import io
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+REQUIRED_COLUMNS = ['city', 'timestamp', 'temperature', 'season']
+SEASONS = ['winter', 'spring', 'summer', 'autumn']
+DATE_FORMAT = 'ISO8601'
+CHUNK_SIZE = 250_000
+
+CSV_DTYPES = {
+    'city': str,
+    'timestamp': str,
+    'temperature': np.float64,
+    'season': str
+}
+
+
+class DataValidationError(ValueError):
+    pass
+
+
+def _source_size(source):
+    if isinstance(source, (bytes, bytearray)):
+        return len(source)
+    if isinstance(source, str):
+        return os.path.getsize(source)
+    return None
+
+
+def _validate_chunk(chunk, first_row):
+    missing = [column for column in REQUIRED_COLUMNS if column not in chunk.columns]
+    if missing:
+        raise DataValidationError(
+            f"Отсутствуют обязательные колонки: {', '.join(missing)}. "
+            f"Ожидается: {', '.join(REQUIRED_COLUMNS)}"
+        )
+
+    for column in REQUIRED_COLUMNS:
+        empty = chunk[column].isna()
+        if empty.any():
+            row = first_row + int(np.flatnonzero(empty.values)[0])
+            raise DataValidationError(f"Пустое значение в колонке '{column}' (строка {row})")
+
+    timestamps = pd.to_datetime(chunk['timestamp'], format=DATE_FORMAT, errors='coerce')
+    invalid = timestamps.isna()
+    if invalid.any():
+        position = int(np.flatnonzero(invalid.values)[0])
+        raise DataValidationError(
+            f"Некорректная дата '{chunk['timestamp'].iloc[position]}' (строка {first_row + position}), "
+            f"ожидается формат YYYY-MM-DD"
+        )
+
+    seasons = pd.Categorical(chunk['season'], categories=SEASONS)
+    invalid = seasons.isna()
+    if invalid.any():
+        position = int(np.flatnonzero(invalid)[0])
+        raise DataValidationError(
+            f"Неизвестный сезон '{chunk['season'].iloc[position]}' (строка {first_row + position}), "
+            f"допустимые значения: {', '.join(SEASONS)}"
+        )
+
+    return timestamps.values, seasons
+
+
+def ingest_csv(source, chunksize=CHUNK_SIZE):
+    start_time = time.perf_counter()
+    size_bytes = _source_size(source)
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+
+    cities, timestamps, temperatures, seasons = [], [], [], []
+    rows = 0
+    chunks = 0
+
+    try:
+        reader = pd.read_csv(
+            source,
+            usecols=lambda column: column in REQUIRED_COLUMNS,
+            dtype=CSV_DTYPES,
+            chunksize=chunksize
+        )
+        for chunk in reader:
+            chunk_timestamps, chunk_seasons = _validate_chunk(chunk, first_row=rows + 2)
+
+            cities.append(pd.Categorical(chunk['city']))
+            timestamps.append(chunk_timestamps)
+            temperatures.append(chunk['temperature'].to_numpy(dtype=np.float64))
+            seasons.append(chunk_seasons)
+
+            rows += len(chunk)
+            chunks += 1
+    except (ValueError, pd.errors.ParserError) as e:
+        if isinstance(e, DataValidationError):
+            raise
+        raise DataValidationError(f"Ошибка разбора CSV: {e}")
+
+    if rows == 0:
+        raise DataValidationError("Файл не содержит данных")
+
+    df = pd.DataFrame({
+        'city': union_categoricals(cities),
+        'timestamp': np.concatenate(timestamps),
+        'temperature': np.concatenate(temperatures),
+        'season': union_categoricals(seasons)
+    })
+
+    execution_time = time.perf_counter() - start_time
+    memory_bytes = int(df.memory_usage(deep=True).sum())
+
+    report = {
+        'rows': rows,
+        'chunks': chunks,
+        'seconds': execution_time,
+        'rows_per_second': rows / execution_time if execution_time > 0 else 0.0,
+        'input_mb': size_bytes / 2**20 if size_bytes is not None else None,
+        'mb_per_second': (size_bytes / 2**20) / execution_time if size_bytes and execution_time > 0 else None,
+        'memory_mb': memory_bytes / 2**20
+    }
+
+    return df, report
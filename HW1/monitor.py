@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import deque
+
+import pandas as pd
+
+from analysis import classify_readings, get_current_season
+from weather_api import stream_weather_batches_async, submit_coroutine
+
+HISTORY_COLUMNS = ['polled_at', 'city', 'temperature', 'feels_like', 'description', 'error']
+READING_COLUMNS = ['city', 'polled_at', 'temperature', 'feels_like', 'description']
+
+
+class WeatherMonitor:
+    def __init__(self, cities, api_key, seasonal_bounds, client=None, history_size=10000):
+        self.cities = list(cities)
+        self.api_key = api_key
+        self.seasonal_bounds = seasonal_bounds
+        self.client = client
+        self.history_size = history_size
+
+        self._lock = threading.Lock()
+        self._history = deque()
+        self._history_rows = 0
+        self._latest = self._classify(pd.DataFrame(columns=READING_COLUMNS))
+        self._poll_future = None
+        self.last_poll_started = None
+        self.last_poll_finished = None
+        self.polls = 0
+
+    def is_polling(self):
+        return self._poll_future is not None and not self._poll_future.done()
+
+    def is_due(self, interval):
+        if self.is_polling():
+            return False
+        return self.last_poll_started is None or time.time() - self.last_poll_started >= interval
+
+    def start_poll(self, deadline=None):
+        if self.is_polling():
+            return False
+
+        self.last_poll_started = time.time()
+        self._poll_future = submit_coroutine(self._poll(deadline))
+        return True
+
+    async def _poll(self, deadline):
+        polled_at = pd.Timestamp.now()
+
+        stream = stream_weather_batches_async(self.cities, self.api_key, deadline, self.client)
+        async for batch in stream:
+            readings = pd.DataFrame({
+                'city': batch.column('city'),
+                'polled_at': polled_at,
+                'temperature': batch.column('temperature'),
+                'feels_like': batch.column('feels_like'),
+                'description': batch.column('description')
+            }, columns=READING_COLUMNS)
+            errors = batch.errors_frame()
+            errors['polled_at'] = polled_at
+            self._record(self._classify(readings), errors)
+
+        with self._lock:
+            self.polls += 1
+            self.last_poll_finished = time.time()
+
+    def _classify(self, readings):
+        return classify_readings(readings, self.seasonal_bounds, get_current_season())
+
+    def _record(self, readings, errors):
+        frames = [frame for frame in (readings, errors) if not frame.empty]
+        if not frames:
+            return
+        rows = pd.concat(frames, ignore_index=True).reindex(columns=HISTORY_COLUMNS)
+
+        with self._lock:
+            self._history.append(rows)
+            self._history_rows += len(rows)
+            while self._history_rows > self.history_size and len(self._history) > 1:
+                self._history_rows -= len(self._history.popleft())
+
+            if not readings.empty:
+                kept = self._latest[~self._latest['city'].isin(readings['city'])]
+                frames = [frame for frame in (kept, readings) if not frame.empty]
+                self._latest = pd.concat(frames, ignore_index=True)
+
+    def history(self):
+        with self._lock:
+            frames = list(self._history)
+        if not frames:
+            return pd.DataFrame(columns=HISTORY_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+    def latest(self):
+        with self._lock:
+            return self._latest
+
+    def errors(self):
+        history = self.history()
+        if history.empty:
+            return history
+        last = history.drop_duplicates('city', keep='last')
+        return last[last['error'].notna()][['polled_at', 'city', 'error']]
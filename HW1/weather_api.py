@@ -1,16 +1,168 @@
 import requests
 import aiohttp
 import asyncio
+from collections import deque
+import numpy as np
+import pandas as pd
+import atexit
+import threading
 import time
 
 BASE_URL = "https://api.openweathermap.org/data/2.5/weather"
 
+SHARED_CONNECTION_LIMIT = 100
+SHARED_DNS_CACHE_TTL = 300
+
+_background_loop = None
+_background_thread = None
+_background_lock = threading.Lock()
+_shared_session = None
+
+WEATHER_FIELDS = (
+    'city', 'temperature', 'feels_like', 'humidity', 'pressure',
+    'description', 'wind_speed', 'clouds', 'cod'
+)
+
+WEATHER_COLUMN_DTYPES = {
+    'city': object,
+    'temperature': np.float32,
+    'feels_like': np.float32,
+    'humidity': np.int16,
+    'pressure': np.int32,
+    'description': object,
+    'wind_speed': np.float32,
+    'clouds': np.int16,
+    'cod': np.int16
+}
+
 class WeatherAPIError(Exception):
     pass
 
 class InvalidAPIKeyError(WeatherAPIError):
     pass
 
+class WeatherUnavailableError(WeatherAPIError):
+    pass
+
+class CircuitOpenError(WeatherUnavailableError):
+    pass
+
+class WeatherBatch:
+    def __init__(self, capacity=16):
+        capacity = max(1, capacity)
+        self._size = 0
+        self._columns = {
+            name: np.empty(capacity, dtype=dtype)
+            for name, dtype in WEATHER_COLUMN_DTYPES.items()
+        }
+        self.errors = []
+
+    def __len__(self):
+        return self._size
+
+    def _reserve(self):
+        capacity = len(self._columns['city'])
+        if self._size < capacity:
+            return
+        for name, column in self._columns.items():
+            grown = np.empty(capacity * 2, dtype=column.dtype)
+            grown[:capacity] = column
+            self._columns[name] = grown
+
+    def append_response(self, data, city=None):
+        self._reserve()
+        i = self._size
+        main = data['main']
+        columns = self._columns
+
+        columns['city'][i] = city if city is not None else data['name']
+        columns['temperature'][i] = main['temp']
+        columns['feels_like'][i] = main['feels_like']
+        columns['humidity'][i] = main['humidity']
+        columns['pressure'][i] = main['pressure']
+        columns['description'][i] = data['weather'][0]['description']
+        columns['wind_speed'][i] = data['wind']['speed']
+        columns['clouds'][i] = data['clouds']['all']
+        columns['cod'][i] = data['cod']
+
+        self._size += 1
+
+    def add_error(self, city, message):
+        self.errors.append({'city': city, 'error': message})
+
+    def column(self, name):
+        return self._columns[name][:self._size]
+
+    @property
+    def columns(self):
+        return {name: self.column(name) for name in WEATHER_FIELDS}
+
+    def to_frame(self):
+        return pd.DataFrame(self.columns, columns=list(WEATHER_FIELDS))
+
+    def errors_frame(self):
+        return pd.DataFrame(self.errors, columns=['city', 'error'])
+
+
+class SingleFlight:
+    def __init__(self):
+        self._in_flight = {}
+        self._lock = threading.RLock()
+        self.requests = 0
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, key, func, *args):
+        with self._lock:
+            self.requests += 1
+            future = self._in_flight.get(key)
+            if future is None:
+                self.executed += 1
+                future = submit_coroutine(func(*args))
+                self._in_flight[key] = future
+                future.add_done_callback(lambda done: self._forget(key, done))
+            else:
+                self.coalesced += 1
+
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'executed': self.executed,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._in_flight),
+                'coalesced_percent': (self.coalesced / self.requests) * 100 if self.requests else 0.0
+            }
+
+
+_weather_flight = SingleFlight()
+
+
+def get_request_coalescing_stats():
+    return _weather_flight.stats()
+
+
+def _parse_weather(data):
+    return {
+        'city': data['name'],
+        'temperature': data['main']['temp'],
+        'feels_like': data['main']['feels_like'],
+        'humidity': data['main']['humidity'],
+        'pressure': data['main']['pressure'],
+        'description': data['weather'][0]['description'],
+        'wind_speed': data['wind']['speed'],
+        'clouds': data['clouds']['all'],
+        'cod': data['cod']
+    }
+
+
 def get_current_weather_sync(city, api_key):
     params = {
         'q': city,
@@ -32,17 +184,7 @@ def get_current_weather_sync(city, api_key):
             error_msg = data.get('message', 'Unknown error')
             raise WeatherAPIError(f"API Error: {error_msg}")
 
-        return {
-            'city': data['name'],
-            'temperature': data['main']['temp'],
-            'feels_like': data['main']['feels_like'],
-            'humidity': data['main']['humidity'],
-            'pressure': data['main']['pressure'],
-            'description': data['weather'][0]['description'],
-            'wind_speed': data['wind']['speed'],
-            'clouds': data['clouds']['all'],
-            'cod': data['cod']
-        }
+        return _parse_weather(data)
 
     except requests.RequestException as e:
         raise WeatherAPIError(f"Network error: {str(e)}")
@@ -62,7 +204,8 @@ def get_weather_multiple_cities_sync(cities, api_key):
     execution_time = time.time() - start_time
     return results, execution_time
 
-async def get_current_weather_async(city, api_key, session=None):
+async def _request_weather_data_async(city, api_key, timeout=10):
+    session = await get_shared_session()
     params = {
         'q': city,
         'appid': api_key,
@@ -70,13 +213,11 @@ async def get_current_weather_async(city, api_key, session=None):
         'lang': 'ru'
     }
 
-    close_session = False
-    if session is None:
-        session = aiohttp.ClientSession()
-        close_session = True
-
     try:
-        async with session.get(BASE_URL, params=params, timeout=aiohttp.ClientTimeout(total=10)) as response:
+        async with session.get(BASE_URL, params=params, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            if response.status >= 500:
+                raise WeatherUnavailableError(f"API Error: upstream status {response.status}")
+
             data = await response.json()
 
             if response.status == 401:
@@ -88,54 +229,374 @@ async def get_current_weather_async(city, api_key, session=None):
                 error_msg = data.get('message', 'Unknown error')
                 raise WeatherAPIError(f"API Error: {error_msg}")
 
-            return {
-                'city': data['name'],
-                'temperature': data['main']['temp'],
-                'feels_like': data['main']['feels_like'],
-                'humidity': data['main']['humidity'],
-                'pressure': data['main']['pressure'],
-                'description': data['weather'][0]['description'],
-                'wind_speed': data['wind']['speed'],
-                'clouds': data['clouds']['all'],
-                'cod': data['cod']
-            }
+            return data
 
+    except asyncio.TimeoutError:
+        raise WeatherUnavailableError(f"Timeout after {timeout} s")
     except aiohttp.ClientError as e:
-        raise WeatherAPIError(f"Network error: {str(e)}")
-    finally:
-        if close_session:
-            await session.close()
+        raise WeatherUnavailableError(f"Network error: {str(e)}")
+
+
+async def _fetch_weather_data_async(city, api_key):
+    key = (city.strip().lower(), api_key)
+    return await _weather_flight.do(key, _request_weather_data_async, city, api_key)
+
+
+class HedgePolicy:
+    def __init__(self, quantile=0.95, min_samples=20, initial_delay=1.0,
+                 min_delay=0.05, max_delay=5.0, window=200):
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self._latencies = deque(maxlen=window)
+
+    def record(self, latency):
+        self._latencies.append(latency)
+
+    def delay(self):
+        if len(self._latencies) < self.min_samples:
+            return self.initial_delay
+        delay = float(np.quantile(self._latencies, self.quantile))
+        return min(self.max_delay, max(self.min_delay, delay))
+
+
+class CircuitBreaker:
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._probe_in_flight = False
+
+    def allow_request(self):
+        if self.state == self.CLOSED:
+            return True
+
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self._probe_in_flight = False
+        self.failures += 1
+
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.times_opened += 1
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def release(self):
+        self._probe_in_flight = False
+
+
+class WeatherClient:
+    def __init__(self, api_key, hedge=None, breaker=None, timeout=10):
+        self.api_key = api_key
+        self.hedge = hedge
+        self.breaker = breaker
+        self.timeout = timeout
+        self._last_good = {}
+        self.counters = {
+            'requests': 0,
+            'upstream_calls': 0,
+            'failures': 0,
+            'hedged': 0,
+            'hedge_wins': 0,
+            'short_circuited': 0,
+            'stale_served': 0
+        }
+
+    async def fetch_data(self, city):
+        key = (city.strip().lower(), self.api_key, id(self))
+        return await _weather_flight.do(key, self._fetch_uncoalesced, city)
+
+    async def get_current_weather(self, city):
+        return _parse_weather(await self.fetch_data(city))
+
+    async def _fetch_uncoalesced(self, city):
+        self.counters['requests'] += 1
+        cache_key = city.strip().lower()
+
+        if self.breaker is not None and not self.breaker.allow_request():
+            self.counters['short_circuited'] += 1
+            cached = self._last_good.get(cache_key)
+            if cached is not None:
+                self.counters['stale_served'] += 1
+                return cached
+            raise CircuitOpenError(f"Circuit open, no cached data for {city}")
+
+        try:
+            if self.hedge is not None:
+                data = await self._hedged_request(city)
+            else:
+                data = await self._request(city)
+        except WeatherUnavailableError:
+            self.counters['failures'] += 1
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            raise
+        except BaseException:
+            if self.breaker is not None:
+                self.breaker.release()
+            raise
+
+        if self.breaker is not None:
+            self.breaker.record_success()
+        self._last_good[cache_key] = data
+        return data
+
+    async def _request(self, city):
+        self.counters['upstream_calls'] += 1
+        return await _request_weather_data_async(city, self.api_key, self.timeout)
+
+    async def _timed_request(self, city):
+        start = time.monotonic()
+        data = await self._request(city)
+        self.hedge.record(time.monotonic() - start)
+        return data
+
+    async def _hedged_request(self, city):
+        primary = asyncio.ensure_future(self._timed_request(city))
+        backup = None
+
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.hedge.delay())
+            if done:
+                return primary.result()
+
+            self.counters['hedged'] += 1
+            backup = asyncio.ensure_future(self._timed_request(city))
+            pending = {primary, backup}
+            error = None
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            self.counters['hedge_wins'] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in (primary, backup):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def stats(self):
+        stats = dict(self.counters)
+        if self.hedge is not None:
+            stats['hedge_delay'] = self.hedge.delay()
+        if self.breaker is not None:
+            stats['breaker_state'] = self.breaker.state
+            stats['breaker_opened'] = self.breaker.times_opened
+        return stats
+
+
+async def get_current_weather_async(city, api_key):
+    data = await _fetch_weather_data_async(city, api_key)
+    return _parse_weather(data)
 
 
 async def get_weather_multiple_cities_async(cities, api_key):
     start_time = time.time()
 
-    async with aiohttp.ClientSession() as session:
-        tasks = [
-            get_current_weather_async(city, api_key, session)
-            for city in cities
-        ]
+    tasks = [
+        get_current_weather_async(city, api_key)
+        for city in cities
+    ]
 
-        results = []
-        responses = await asyncio.gather(*tasks, return_exceptions=True)
+    results = []
+    responses = await asyncio.gather(*tasks, return_exceptions=True)
 
-        for city, response in zip(cities, responses):
-            if isinstance(response, Exception):
-                results.append({'city': city, 'error': str(response)})
-            else:
-                results.append(response)
+    for city, response in zip(cities, responses):
+        if isinstance(response, Exception):
+            results.append({'city': city, 'error': str(response)})
+        else:
+            results.append(response)
 
     execution_time = time.time() - start_time
     return results, execution_time
 
-def run_async_weather(cities, api_key):
+async def _stream_weather_chunks(cities, api_key, deadline=None, client=None):
+    if client is not None:
+        fetch = client.fetch_data
+    else:
+        async def fetch(city):
+            return await _fetch_weather_data_async(city, api_key)
+
+    tasks = {
+        asyncio.ensure_future(fetch(city)): city
+        for city in cities
+    }
+    pending = set(tasks)
+
+    loop = asyncio.get_running_loop()
+    deadline_at = loop.time() + deadline if deadline is not None else None
+
+    try:
+        while pending:
+            timeout = None
+            if deadline_at is not None:
+                timeout = max(0, deadline_at - loop.time())
+
+            done, pending = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                break
+
+            chunk = []
+            for task in done:
+                error = task.exception()
+                if error is not None:
+                    chunk.append((tasks[task], None, str(error)))
+                else:
+                    chunk.append((tasks[task], task.result(), None))
+            yield chunk
+
+        for task in pending:
+            task.cancel()
+        if pending:
+            yield [(tasks[task], None, f"Deadline exceeded ({deadline} s)") for task in pending]
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def _stream_weather_data(cities, api_key, deadline=None, client=None):
+    async for chunk in _stream_weather_chunks(cities, api_key, deadline, client):
+        for item in chunk:
+            yield item
+
+
+async def stream_weather_multiple_cities_async(cities, api_key, deadline=None, client=None):
+    async for city, data, error in _stream_weather_data(cities, api_key, deadline, client):
+        if error is not None:
+            yield {'city': city, 'error': error}
+        else:
+            try:
+                yield _parse_weather(data)
+            except (KeyError, IndexError, TypeError) as e:
+                yield {'city': city, 'error': f"Malformed response: {e}"}
+
+
+async def stream_weather_batches_async(cities, api_key, deadline=None, client=None):
+    async for chunk in _stream_weather_chunks(cities, api_key, deadline, client):
+        batch = WeatherBatch(capacity=len(chunk))
+        for city, data, error in chunk:
+            if error is not None:
+                batch.add_error(city, error)
+                continue
+            try:
+                batch.append_response(data, city)
+            except (KeyError, IndexError, TypeError) as e:
+                batch.add_error(city, f"Malformed response: {e}")
+        yield batch
+
+
+def stream_weather_multiple_cities(cities, api_key, deadline=None, client=None):
+    stream = stream_weather_multiple_cities_async(cities, api_key, deadline, client)
+
     try:
-        loop = asyncio.get_event_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        while True:
+            try:
+                yield run_in_background_loop(stream.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        run_in_background_loop(stream.aclose())
+
+
+def get_background_loop():
+    global _background_loop, _background_thread
+
+    with _background_lock:
+        if _background_thread is None or not _background_thread.is_alive():
+            _background_loop = asyncio.new_event_loop()
+            _background_thread = threading.Thread(
+                target=_background_loop.run_forever,
+                name="weather-api-loop",
+                daemon=True
+            )
+            _background_thread.start()
+
+    return _background_loop
+
+
+def submit_coroutine(coro):
+    return asyncio.run_coroutine_threadsafe(coro, get_background_loop())
+
+
+def run_in_background_loop(coro, timeout=None):
+    return submit_coroutine(coro).result(timeout)
+
+
+async def get_shared_session():
+    global _shared_session
+
+    if _shared_session is None or _shared_session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=SHARED_CONNECTION_LIMIT,
+            ttl_dns_cache=SHARED_DNS_CACHE_TTL
+        )
+        _shared_session = aiohttp.ClientSession(connector=connector)
+
+    return _shared_session
+
+
+async def _close_shared_session():
+    global _shared_session
+
+    if _shared_session is not None and not _shared_session.closed:
+        await _shared_session.close()
+    _shared_session = None
+
+
+def shutdown_background_loop():
+    global _background_loop, _background_thread
+
+    with _background_lock:
+        if _background_thread is None or not _background_thread.is_alive():
+            return
+
+        asyncio.run_coroutine_threadsafe(_close_shared_session(), _background_loop).result(5)
+        _background_loop.call_soon_threadsafe(_background_loop.stop)
+        _background_thread.join(5)
+        _background_loop.close()
+
+        _background_loop = None
+        _background_thread = None
+
+
+atexit.register(shutdown_background_loop)
+
+
+def run_async_weather(cities, api_key):
+    return run_in_background_loop(get_weather_multiple_cities_async(cities, api_key))
 
-    return loop.run_until_complete(get_weather_multiple_cities_async(cities, api_key))
 
 def benchmark_api_methods(cities, api_key, runs=3):
     sync_times = []
@@ -204,5 +665,8 @@ if __name__ == "__main__":
     print("  - get_current_weather_async(city, api_key)")
     print("  - get_weather_multiple_cities_sync(cities, api_key)")
     print("  - get_weather_multiple_cities_async(cities, api_key)")
+    print("  - stream_weather_multiple_cities(cities, api_key, deadline)")
+    print("  - stream_weather_batches_async(cities, api_key, deadline)")
     print("  - benchmark_api_methods(cities, api_key)")
+    print("  - get_request_coalescing_stats()")
     print("  - validate_api_key(api_key)")
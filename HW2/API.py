@@ -1,11 +1,10 @@
 import aiohttp
+import asyncio
 import json
 from config import OPENWEATHER_API_KEY, OPENROUTER_API_KEY
+from http_client import get_client
 from logger import log
 
-API_TIMEOUT = 10
-MAX_RETRIES = 2
-
 async def get_temperature(city):
     url = "http://api.openweathermap.org/data/2.5/weather"
     params = {
@@ -14,25 +13,19 @@ async def get_temperature(city):
         'units': 'metric'
     }
 
-    for attempt in range(MAX_RETRIES):
-        try:
-            timeout = aiohttp.ClientTimeout(total=API_TIMEOUT)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        temp = data['main']['temp']
-                        return temp
-                    else:
-                        log.warning(f"API погоды вернул статус {response.status} для города {city}")
-                        return None
-        except aiohttp.ClientError as e:
-            log.error(f"Сетевая ошибка при запросе погоды (попытка {attempt + 1}/{MAX_RETRIES}): {e}")
-            if attempt == MAX_RETRIES - 1:
-                return None
-        except Exception as e:
-            log.error(f"Неожиданная ошибка при запросе погоды: {e}")
-            return None
+    try:
+        status, data = await get_client("openweather").request('GET', url, params=params)
+        if status == 200:
+            return data['main']['temp']
+
+        log.warning(f"API погоды вернул статус {status} для города {city}")
+        return None
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        log.error(f"Сетевая ошибка при запросе погоды для {city}: {e!r}")
+        return None
+    except Exception as e:
+        log.error(f"Неожиданная ошибка при запросе погоды: {e}")
+        return None
 
 async def search_food_nutrition(food_name):
     if not OPENROUTER_API_KEY:
@@ -63,32 +56,29 @@ All values are per 100g. Use average values for this food item."""
     }
 
     try:
-        timeout = aiohttp.ClientTimeout(total=API_TIMEOUT)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.post(url, headers=headers, json=payload) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    content = data['choices'][0]['message']['content'].strip()
-
-                    content = content.replace('```json', '').replace('```', '').strip()
-
-                    nutrition_data = json.loads(content)
-
-                    return {
-                        'name': food_name,
-                        'calories_per_100g': float(nutrition_data.get('calories', 0)),
-                        'protein_per_100g': float(nutrition_data.get('protein', 0)),
-                        'carbs_per_100g': float(nutrition_data.get('carbs', 0)),
-                        'fat_per_100g': float(nutrition_data.get('fat', 0))
-                    }
-                else:
-                    log.warning(f"OpenRouter API вернул статус {response.status}")
-                    return None
+        status, data = await get_client("openrouter").request('POST', url, headers=headers, json=payload)
+        if status != 200:
+            log.warning(f"OpenRouter API вернул статус {status}")
+            return None
+
+        content = data['choices'][0]['message']['content'].strip()
+
+        content = content.replace('```json', '').replace('```', '').strip()
+
+        nutrition_data = json.loads(content)
+
+        return {
+            'name': food_name,
+            'calories_per_100g': float(nutrition_data.get('calories', 0)),
+            'protein_per_100g': float(nutrition_data.get('protein', 0)),
+            'carbs_per_100g': float(nutrition_data.get('carbs', 0)),
+            'fat_per_100g': float(nutrition_data.get('fat', 0))
+        }
     except json.JSONDecodeError as e:
         log.error(f"Ошибка парсинга JSON {e}")
         return None
-    except aiohttp.ClientError as e:
-        log.error(f"Сетевая ошибка при поиске продукта {e}")
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        log.error(f"Сетевая ошибка при поиске продукта {e!r}")
         return None
     except Exception as e:
         log.error(f"Неожиданная ошибка при поиске продукта {e}")
@@ -0,0 +1,78 @@
+import argparse
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+BACKENDS = ['altair', 'matplotlib']
+
+
+def sample_rows(days=7):
+    return [
+        {
+            'date': f'{day:02d}.10',
+            'water_logged': 1800 + day * 150,
+            'water_goal': 2500,
+            'calories_net': 1700 + day * 60,
+            'calorie_goal': 2100
+        }
+        for day in range(1, days + 1)
+    ]
+
+
+def measure(backend, runs):
+    rows = sample_rows()
+
+    started = time.perf_counter()
+    from chart_render import render_progress_png
+    png = render_progress_png(rows, backend)
+    first_render = time.perf_counter() - started
+
+    latencies = []
+    tracemalloc.start()
+    for _ in range(runs):
+        started = time.perf_counter()
+        png = render_progress_png(rows, backend)
+        latencies.append(time.perf_counter() - started)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        'backend': backend,
+        'first_render_ms': first_render * 1000,
+        'mean_ms': statistics.mean(latencies) * 1000,
+        'p95_ms': latencies[int(0.95 * (len(latencies) - 1))] * 1000,
+        'tracemalloc_peak_kb': peak / 1024,
+        'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'png_kb': len(png) / 1024
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение backend'ов отрисовки графика прогресса")
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--backend', choices=BACKENDS)
+    args = parser.parse_args()
+
+    if args.backend:
+        print(json.dumps(measure(args.backend, args.runs)))
+        return
+
+    columns = ['first_render_ms', 'mean_ms', 'p95_ms', 'tracemalloc_peak_kb', 'max_rss_mb', 'png_kb']
+    print(f"{'backend':<12}" + ''.join(f"{column:>21}" for column in columns))
+
+    for backend in BACKENDS:
+        output = subprocess.run(
+            [sys.executable, __file__, '--backend', backend, '--runs', str(args.runs)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{backend:<12}" + ''.join(f"{result[column]:>21.1f}" for column in columns))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+import asyncio
+import os
+from aiogram import Bot, Dispatcher
+from config import BOT_TOKEN
+from handlers import setup_handlers
+from middlewares import LoggingMiddleware
+from logger import log
+from services import NutritionService
+import database
+import http_client
+import charts
+
+bot = Bot(token=BOT_TOKEN)
+dp = Dispatcher()
+
+dp.message.middleware(LoggingMiddleware())
+setup_handlers(dp)
+
+async def on_startup():
+    log.info("Запуск бота")
+    await database.create_pool()
+    await http_client.start_clients()
+    charts.render_pool.start()
+    await NutritionService.load_local_foods()
+    log.info("Бот готов к работе")
+
+async def on_shutdown():
+    log.info("Остановка бота")
+    charts.render_pool.shutdown()
+    await http_client.close_clients()
+    await database.close_pool()
+    log.info("Бот остановлен")
+
+async def main():
+    await on_startup()
+
+    try:
+        if os.getenv("RENDER"):
+            from healthcheck_server import run_healthcheck
+            log.info("Запуск healthcheck сервера для Render")
+            await asyncio.gather(
+                dp.start_polling(bot),
+                run_healthcheck()
+            )
+        else:
+            log.info("Бот запущен")
+            await dp.start_polling(bot)
+    finally:
+        await on_shutdown()
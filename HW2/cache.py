@@ -0,0 +1,121 @@
+import abc
+import asyncio
+import time
+from collections import OrderedDict
+
+
+class CacheBackend(abc.ABC):
+    @abc.abstractmethod
+    async def get(self, key):
+        pass
+
+    @abc.abstractmethod
+    async def set(self, key, value, ttl):
+        pass
+
+    @abc.abstractmethod
+    async def delete(self, key):
+        pass
+
+
+class MemoryTTLCache(CacheBackend):
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+
+    async def get(self, key):
+        item = self._items.get(key)
+        if item is None:
+            return None
+
+        value, expires_at = item
+        if expires_at <= time.monotonic():
+            del self._items[key]
+            return None
+
+        self._items.move_to_end(key)
+        return value
+
+    async def set(self, key, value, ttl):
+        self._items[key] = (value, time.monotonic() + ttl)
+        self._items.move_to_end(key)
+
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    async def delete(self, key):
+        self._items.pop(key, None)
+
+    def __len__(self):
+        return len(self._items)
+
+
+class Cache:
+    def __init__(self, backend, ttl, namespace):
+        self.backend = backend
+        self.ttl = ttl
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.generation = 0
+
+    def _key(self, key):
+        return f"{self.namespace}:{key}"
+
+    async def get(self, key):
+        value = await self.backend.get(self._key(key))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key, value, generation=None):
+        if generation is not None and generation != self.generation:
+            return
+        await self.backend.set(self._key(key), value, self.ttl)
+
+    async def write(self, key, value):
+        self.generation += 1
+        await self.backend.set(self._key(key), value, self.ttl)
+
+    async def invalidate(self, key):
+        self.generation += 1
+        self.invalidations += 1
+        await self.backend.delete(self._key(key))
+
+    def stats(self):
+        requests = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'hit_rate': self.hits / requests if requests else 0.0
+        }
+
+
+class SingleFlight:
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._inflight = {}
+
+    async def do(self, key, func, *args):
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        self.calls += 1
+        future = asyncio.ensure_future(func(*args))
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    def stats(self):
+        return {
+            'calls': self.calls,
+            'coalesced': self.coalesced,
+            'inflight': len(self._inflight)
+        }
@@ -0,0 +1,144 @@
+from io import BytesIO
+
+WATER_COLOR = '#2196F3'
+CALORIE_COLOR = '#4CAF50'
+GOAL_COLOR = '#FF9800'
+MAX_X_TICKS = 10
+
+_figure = None
+
+
+def warm_up(backend):
+    if backend == 'matplotlib':
+        _figure_template()
+    elif backend == 'altair':
+        import altair
+
+
+def render_progress_png(data_rows, backend='altair'):
+    if backend == 'matplotlib':
+        return _render_matplotlib(data_rows)
+    if backend == 'altair':
+        return _render_altair(data_rows)
+    raise ValueError(f"Неизвестный backend графиков: {backend}")
+
+
+def _render_altair(data_rows):
+    import altair as alt
+    import pandas as pd
+
+    df = pd.DataFrame(data_rows)
+
+    water_line = alt.Chart(df).mark_line(point=True, color=WATER_COLOR).encode(
+        x=alt.X('date:N', title='Дата', sort=None, axis=alt.Axis(labelAngle=0)),
+        y=alt.Y('water_logged:Q', title='Вода (мл)'),
+        tooltip=['date', 'water_logged']
+    )
+
+    water_goal_line = alt.Chart(df).mark_line(strokeDash=[5, 5], color=GOAL_COLOR).encode(
+        x=alt.X('date:N', sort=None),
+        y='water_goal:Q',
+        tooltip=['date', 'water_goal']
+    )
+
+    water_chart = (water_line + water_goal_line).properties(
+        title='Потребление воды',
+        width=600,
+        height=250
+    )
+
+    calorie_line = alt.Chart(df).mark_line(point=True, color=CALORIE_COLOR).encode(
+        x=alt.X('date:N', title='Дата', sort=None, axis=alt.Axis(labelAngle=0)),
+        y=alt.Y('calories_net:Q', title='Калории (ккал)'),
+        tooltip=['date', 'calories_net']
+    )
+
+    calorie_goal_line = alt.Chart(df).mark_line(strokeDash=[5, 5], color=GOAL_COLOR).encode(
+        x=alt.X('date:N', sort=None),
+        y='calorie_goal:Q',
+        tooltip=['date', 'calorie_goal']
+    )
+
+    calorie_chart = (calorie_line + calorie_goal_line).properties(
+        title='Баланс калорий',
+        width=600,
+        height=250
+    )
+
+    final_chart = alt.vconcat(
+        water_chart,
+        calorie_chart
+    ).properties(
+        title='Прогресс за последние дни'
+    ).configure_title(
+        fontSize=16,
+        anchor='start'
+    )
+
+    buf = BytesIO()
+    final_chart.save(buf, format='png', scale_factor=2.0)
+    return buf.getvalue()
+
+
+def _figure_template():
+    global _figure
+
+    if _figure is None:
+        import matplotlib
+        matplotlib.use('Agg')
+        from matplotlib.figure import Figure
+
+        _figure = Figure(figsize=(6.6, 6.6), dpi=100)
+        _figure.suptitle('Прогресс за последние дни', x=0.02, ha='left', fontsize=15, fontweight='bold')
+        water_ax, calorie_ax = _figure.subplots(2, 1)
+        _figure.subplots_adjust(left=0.12, right=0.97, top=0.88, bottom=0.08, hspace=0.45)
+
+        for ax, color, title, ylabel in (
+            (water_ax, WATER_COLOR, 'Потребление воды', 'Вода (мл)'),
+            (calorie_ax, CALORIE_COLOR, 'Баланс калорий', 'Калории (ккал)')
+        ):
+            ax.plot([], [], color=color, marker='o', markersize=4)
+            ax.plot([], [], color=GOAL_COLOR, linestyle=(0, (5, 5)))
+            ax.set_title(title, loc='left', fontsize=12, fontweight='bold')
+            ax.set_xlabel('Дата')
+            ax.set_ylabel(ylabel)
+            ax.grid(axis='y', color='#dddddd', linewidth=0.6)
+            ax.set_axisbelow(True)
+            for spine in ('top', 'right'):
+                ax.spines[spine].set_visible(False)
+
+    return _figure
+
+
+def _update_panel(ax, dates, values, goals):
+    positions = range(len(dates))
+    value_line, goal_line = ax.lines
+    value_line.set_data(positions, values)
+    goal_line.set_data(positions, goals)
+
+    top = max(max(values, default=0), max(goals, default=0))
+    ax.set_xlim(-0.5, len(dates) - 0.5)
+    ax.set_ylim(min(0, min(values, default=0)), top * 1.08 or 1)
+    step = max(1, -(-len(dates) // MAX_X_TICKS))
+    ax.set_xticks(positions[::step], dates[::step])
+
+
+def _render_matplotlib(data_rows):
+    figure = _figure_template()
+    water_ax, calorie_ax = figure.axes
+    dates = [row['date'] for row in data_rows]
+
+    _update_panel(
+        water_ax, dates,
+        [row['water_logged'] for row in data_rows],
+        [row['water_goal'] for row in data_rows]
+    )
+    _update_panel(
+        calorie_ax, dates,
+        [row['calories_net'] for row in data_rows],
+        [row['calorie_goal'] for row in data_rows]
+    )
+
+    buf = BytesIO()
+    figure.savefig(buf, format='png', dpi=200)
+    return buf.getvalue()
@@ -1,22 +1,176 @@
-import altair as alt
-import pandas as pd
-from io import BytesIO
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from cache import Cache, MemoryTTLCache
+from chart_render import render_progress_png, warm_up
+from config import (
+    CHART_RENDER_WORKERS, CHART_RENDER_QUEUE, CHART_CACHE_TTL, CHART_CACHE_SIZE, CHART_BACKEND,
+    HISTORY_PERIODS
+)
+from dto import ChartDTO
+from metrics import register_metrics
 from repositories import UserRepository, DiaryRepository
 from logger import log
 
+
+class RenderQueueFull(Exception):
+    pass
+
+
+class RenderFailed(Exception):
+    pass
+
+
+class ChartRenderPool:
+    def __init__(self, workers, queue_size, initializer=None, initargs=()):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.initializer = initializer
+        self.initargs = initargs
+        self._executor = None
+        self._slots = None
+
+        self.in_flight = 0
+        self.renders = 0
+        self.failures = 0
+        self.rejected = 0
+        self.restarts = 0
+        self.total_wait = 0.0
+        self.total_render = 0.0
+        self.max_render = 0.0
+
+    def start(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=self.initializer,
+                initargs=self.initargs
+            )
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def render(self, func, *args):
+        self.start()
+
+        if self.in_flight >= self.workers + self.queue_size:
+            self.rejected += 1
+            raise RenderQueueFull()
+
+        self.in_flight += 1
+        queued_at = time.perf_counter()
+        try:
+            async with self._slots:
+                started = time.perf_counter()
+                self.total_wait += started - queued_at
+
+                loop = asyncio.get_running_loop()
+                executor = self._executor
+                try:
+                    result = await loop.run_in_executor(executor, func, *args)
+                except BrokenProcessPool:
+                    self.failures += 1
+                    self._restart(executor)
+                    raise
+                except Exception:
+                    self.failures += 1
+                    raise
+
+                elapsed = time.perf_counter() - started
+                self.renders += 1
+                self.total_render += elapsed
+                self.max_render = max(self.max_render, elapsed)
+                return result
+        finally:
+            self.in_flight -= 1
+
+    def _restart(self, broken):
+        if self._executor is not broken:
+            return
+        log.error("Пул отрисовки графиков сломан, перезапускаем воркеры")
+        self.restarts += 1
+        self.shutdown()
+        self.start()
+
+    def stats(self):
+        return {
+            'workers': self.workers,
+            'queue_size': self.queue_size,
+            'in_flight': self.in_flight,
+            'renders': self.renders,
+            'failures': self.failures,
+            'rejected': self.rejected,
+            'restarts': self.restarts,
+            'avg_wait_ms': self.total_wait / self.renders * 1000 if self.renders else 0.0,
+            'avg_render_ms': self.total_render / self.renders * 1000 if self.renders else 0.0,
+            'max_render_ms': self.max_render * 1000
+        }
+
+
+render_pool = ChartRenderPool(CHART_RENDER_WORKERS, CHART_RENDER_QUEUE, warm_up, (CHART_BACKEND,))
+
+chart_cache = Cache(MemoryTTLCache(CHART_CACHE_SIZE), CHART_CACHE_TTL, "chart")
+
+chart_versions = Cache(MemoryTTLCache(CHART_CACHE_SIZE), CHART_CACHE_TTL, "chart_version")
+
+register_metrics("chart_render", render_pool.stats)
+
+register_metrics("chart_cache", lambda: {
+    'versions': chart_versions.stats(),
+    'charts': chart_cache.stats()
+})
+
+
+def _rows_digest(data_rows):
+    payload = json.dumps([CHART_BACKEND, data_rows], sort_keys=True, separators=(',', ':'))
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+async def invalidate_user_charts(user_id):
+    await chart_versions.invalidate(user_id)
+
+
+async def remember_file_id(user_id, days, chart, file_id):
+    chart.file_id = file_id
+    await chart_cache.set(f"{user_id}:{days}:{chart.digest}", chart)
+
+
 async def generate_progress_graph(user_id, days=7):
+    today = date.today().isoformat()
+    generation = chart_versions.generation
+    versions = await chart_versions.get(user_id) or {}
+
+    digest = versions.get(f"{today}:{days}")
+    if digest is not None:
+        chart = await chart_cache.get(f"{user_id}:{days}:{digest}")
+        if chart is not None:
+            return chart
+
     historical_data = await DiaryRepository.get_historical_data(user_id, days)
     user = await UserRepository.get_by_id(user_id)
 
     if not historical_data:
         return None
 
+    date_format = '%m.%Y' if HISTORY_PERIODS.get(days) == 'month' else '%d.%m'
+
     data_rows = []
     for record in historical_data:
-        date_str = record.log_date.strftime('%d.%m')
+        date_str = record.log_date.strftime(date_format)
         net_calories = record.logged_calories - record.burned_calories
 
         data_rows.append({
+            'day': record.log_date.isoformat(),
             'date': date_str,
             'water_logged': record.logged_water,
             'water_goal': user.water_goal,
@@ -24,59 +178,22 @@ async def generate_progress_graph(user_id, days=7):
             'calorie_goal': user.calorie_goal
         })
 
-    df = pd.DataFrame(data_rows)
-
-    water_line = alt.Chart(df).mark_line(point=True, color='#2196F3').encode(
-        x=alt.X('date:N', title='Дата', axis=alt.Axis(labelAngle=0)),
-        y=alt.Y('water_logged:Q', title='Вода (мл)'),
-        tooltip=['date', 'water_logged']
-    )
-
-    water_goal_line = alt.Chart(df).mark_line(strokeDash=[5, 5], color='#FF9800').encode(
-        x='date:N',
-        y='water_goal:Q',
-        tooltip=['date', 'water_goal']
-    )
-
-    water_chart = (water_line + water_goal_line).properties(
-        title='Потребление воды',
-        width=600,
-        height=250
-    )
-
-    calorie_line = alt.Chart(df).mark_line(point=True, color='#4CAF50').encode(
-        x=alt.X('date:N', title='Дата', axis=alt.Axis(labelAngle=0)),
-        y=alt.Y('calories_net:Q', title='Калории (ккал)'),
-        tooltip=['date', 'calories_net']
-    )
-
-    calorie_goal_line = alt.Chart(df).mark_line(strokeDash=[5, 5], color='#FF9800').encode(
-        x='date:N',
-        y='calorie_goal:Q',
-        tooltip=['date', 'calorie_goal']
-    )
-
-    calorie_chart = (calorie_line + calorie_goal_line).properties(
-        title='Баланс калорий',
-        width=600,
-        height=250
-    )
-
-    final_chart = alt.vconcat(
-        water_chart,
-        calorie_chart
-    ).properties(
-        title='Прогресс за последние дни'
-    ).configure_title(
-        fontSize=16,
-        anchor='start'
-    )
-
-    try:
-        buf = BytesIO()
-        final_chart.save(buf, format='png', scale_factor=2.0)
-        buf.seek(0)
-        return buf
-    except Exception as e:
-        log.error(f"Ошибка при генерации графика: {e}")
-        return None
+    digest = _rows_digest(data_rows)
+    chart = await chart_cache.get(f"{user_id}:{days}:{digest}")
+
+    if chart is None:
+        try:
+            png = await render_pool.render(render_progress_png, data_rows, CHART_BACKEND)
+        except RenderQueueFull:
+            raise
+        except Exception as e:
+            log.error(f"Ошибка при генерации графика: {e}")
+            raise RenderFailed() from e
+
+        chart = ChartDTO(digest=digest, png=png)
+        await chart_cache.set(f"{user_id}:{days}:{digest}", chart)
+
+    versions = {key: value for key, value in versions.items() if key.startswith(today)}
+    versions[f"{today}:{days}"] = digest
+    await chart_versions.set(user_id, versions, generation)
+    return chart
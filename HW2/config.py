@@ -15,6 +15,62 @@ OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY", "")
 
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
 
+HTTP_UPSTREAMS = {
+    "openweather": {
+        "limit_per_host": 20,
+        "timeout": 10,
+        "max_retries": 2,
+        "backoff_base": 0.3,
+        "backoff_max": 3.0
+    },
+    "openrouter": {
+        "limit_per_host": 10,
+        "timeout": 30,
+        "max_retries": 2,
+        "backoff_base": 1.0,
+        "backoff_max": 8.0
+    }
+}
+
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "300"))
+
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+
+NUTRITION_CACHE_VERSION = 1
+
+NUTRITION_CACHE_TTL = int(os.getenv("NUTRITION_CACHE_TTL", str(30 * 24 * 3600)))
+
+NUTRITION_CACHE_SIZE = int(os.getenv("NUTRITION_CACHE_SIZE", "5000"))
+
+LOCAL_FOODS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "foods.csv")
+
+EXTRA_FOODS_PATHS = [path for path in os.getenv("EXTRA_FOODS_PATHS", "").split(os.pathsep) if path]
+
+FOOD_MATCH_THRESHOLD = 0.7
+
+WEATHER_CACHE_TTL = int(os.getenv("WEATHER_CACHE_TTL", "1800"))
+
+WEATHER_CACHE_SIZE = int(os.getenv("WEATHER_CACHE_SIZE", "1000"))
+
+WEATHER_CACHE_DB = os.getenv("WEATHER_CACHE_DB", "0") == "1"
+
+CHART_RENDER_WORKERS = int(os.getenv("CHART_RENDER_WORKERS", "2"))
+
+CHART_RENDER_QUEUE = int(os.getenv("CHART_RENDER_QUEUE", "8"))
+
+HISTORY_PERIODS = {
+    7: "day",
+    30: "day",
+    90: "week",
+    365: "month"
+}
+
+CHART_BACKEND = os.getenv("CHART_BACKEND", "matplotlib")
+
+CHART_CACHE_TTL = int(os.getenv("CHART_CACHE_TTL", "86400"))
+
+CHART_CACHE_SIZE = int(os.getenv("CHART_CACHE_SIZE", "2000"))
+
 WATER_BASE_RATE = 30
 
 WATER_PER_ACTIVITY_30MIN = 500
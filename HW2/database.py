@@ -1,7 +1,7 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
 from config import DATABASE_URL
-from models import Base
+from migrations import run_migrations
 from logger import log
 
 engine = None
@@ -27,8 +27,7 @@ async def create_pool():
         expire_on_commit=False
     )
 
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    await run_migrations(engine)
 
     log.info("Подключение к БД установлено")
 
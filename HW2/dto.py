@@ -21,6 +21,20 @@ class DailyProgressDTO:
     logged_water: int
     logged_calories: int
     burned_calories: int
+    logged_protein: float = 0.0
+    logged_carbs: float = 0.0
+    logged_fat: float = 0.0
+
+@dataclass
+class DiaryWriteDTO:
+    logged_water: int
+    logged_calories: int
+    burned_calories: int
+    water_goal: int
+    calorie_goal: int
+    logged_protein: float = 0.0
+    logged_carbs: float = 0.0
+    logged_fat: float = 0.0
 
 @dataclass
 class HistoricalDataDTO:
@@ -28,6 +42,15 @@ class HistoricalDataDTO:
     logged_water: int
     logged_calories: int
     burned_calories: int
+    logged_protein: float = 0.0
+    logged_carbs: float = 0.0
+    logged_fat: float = 0.0
+
+@dataclass
+class ChartDTO:
+    digest: str
+    png: bytes
+    file_id: Optional[str] = None
 
 @dataclass
 class FoodNutritionDTO:
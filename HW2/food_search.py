@@ -0,0 +1,117 @@
+import csv
+import re
+
+RU_ENDINGS = (
+    'ами', 'ями', 'ого', 'его', 'ому', 'ему', 'ыми', 'ими',
+    'ая', 'яя', 'ое', 'ее', 'ые', 'ие', 'ый', 'ий', 'ой', 'ую', 'юю',
+    'ов', 'ев', 'ей', 'ам', 'ям', 'ах', 'ях', 'ом', 'ем',
+    'ы', 'и', 'а', 'я', 'у', 'ю', 'е', 'о', 'ь'
+)
+
+MIN_STEM_LENGTH = 3
+
+_non_word = re.compile(r'[^\w\s]+')
+
+
+def stem_word(word):
+    if word.isascii():
+        if word.endswith('ies') and len(word) > 4:
+            return word[:-3] + 'y'
+        if word.endswith('s') and not word.endswith('ss') and len(word) > MIN_STEM_LENGTH:
+            return word[:-1]
+        return word
+
+    for ending in RU_ENDINGS:
+        if word.endswith(ending) and len(word) - len(ending) >= MIN_STEM_LENGTH:
+            return word[:-len(ending)]
+    return word
+
+
+def normalize_food_name(name):
+    name = name.lower().replace('ё', 'е')
+    name = _non_word.sub(' ', name).replace('_', ' ')
+    return ' '.join(sorted(stem_word(word) for word in name.split()))
+
+
+def trigrams(text):
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(grams, other):
+    shared = len(grams & other)
+    return shared / (len(grams) + len(other) - shared) if shared else 0.0
+
+
+class FoodIndex:
+    def __init__(self, threshold=0.7):
+        self.threshold = threshold
+        self._entries = {}
+        self._grams = {}
+        self._postings = {}
+
+    def add(self, name, nutrition):
+        key = normalize_food_name(name)
+        if not key:
+            return
+
+        if key not in self._entries:
+            grams = trigrams(key)
+            self._grams[key] = grams
+            for gram in grams:
+                self._postings.setdefault(gram, set()).add(key)
+
+        self._entries[key] = nutrition
+
+    def load_csv(self, path, make_entry):
+        with open(path, encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                for column in ('name_ru', 'name_en'):
+                    if row.get(column):
+                        self.add(row[column], make_entry(row[column], row))
+
+    def match(self, name):
+        key = normalize_food_name(name)
+        if not key:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+
+        best_key, best_score = self._best_trigram_match(key)
+        if best_key is not None and best_score >= self.threshold:
+            return self._entries[best_key]
+        return None
+
+    def _covers(self, words, candidate):
+        candidate_words = [trigrams(word) for word in candidate.split()]
+        return all(
+            any(similarity(trigrams(word), other) >= self.threshold for other in candidate_words)
+            for word in words
+        )
+
+    def _best_trigram_match(self, key):
+        grams = trigrams(key)
+        overlaps = {}
+        for gram in grams:
+            for candidate in self._postings.get(gram, ()):
+                overlaps[candidate] = overlaps.get(candidate, 0) + 1
+
+        words = key.split()
+        best_key, best_score = None, 0.0
+        for candidate, shared in overlaps.items():
+            score = shared / (len(grams) + len(self._grams[candidate]) - shared)
+            if score < self.threshold or score < best_score:
+                continue
+            if score == best_score and len(candidate) >= len(best_key):
+                continue
+            if self._covers(words, candidate):
+                best_key, best_score = candidate, score
+        return best_key, best_score
+
+    def __len__(self):
+        return len(self._entries)
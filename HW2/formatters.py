@@ -13,7 +13,7 @@ class MessageFormatter:
             "/log_food - Записать прием пищи\n"
             "/log_workout - Записать тренировку\n"
             "/check_progress - Прогресс за сегодня\n"
-            "/graphs - Графики за 7 дней\n"
+            "/graphs [7|30|90|365] - Графики за период (по умолчанию 7 дней)\n"
             "/recommend - Персональные рекомендации\n"
             "/help - Подробная инструкция\n\n"
 
@@ -50,8 +50,9 @@ class MessageFormatter:
             "5. /check_progress - Текущий прогресс за день\n"
             "   Показывает: воду, калории, баланс БЖУ\n\n"
 
-            "6. /graphs - Графики за последние 7 дней\n"
-            "   Визуализация динамики воды и калорий\n\n"
+            "6. /graphs [7|30|90|365] - Графики за последние N дней\n"
+            "   Визуализация динамики воды и калорий\n"
+            "   За 90 дней - средние по неделям, за 365 - по месяцам\n\n"
 
             "7. /recommend - Персональные рекомендации\n"
         )
@@ -78,13 +79,15 @@ class MessageFormatter:
 
     @staticmethod
     def food_logged(original_name, grams, calories, protein, carbs, fat,
-                   net_calories, calorie_goal, remaining, over_limit):
+                   net_calories, calorie_goal, remaining, over_limit,
+                   protein_total, carbs_total, fat_total):
         status = "Превышение!" if over_limit else "Осталось: {} ккал".format(remaining)
         return (
             f"Записано: {original_name} ({grams} г)\n"
             f"Калории: {calories:.1f} ккал\n"
             f"Белки: {protein:.1f} г | Углеводы: {carbs:.1f} г | Жиры: {fat:.1f} г\n\n"
             f"Всего за день: {net_calories}/{calorie_goal} ккал\n"
+            f"За день: белки {protein_total:.1f} г | углеводы {carbs_total:.1f} г | жиры {fat_total:.1f} г\n"
             f"{status}"
         )
 
@@ -131,7 +134,11 @@ class MessageFormatter:
             f"Потреблено: {progress_data['calories_consumed']} ккал\n"
             f"Сожжено: {progress_data['calories_burned']} ккал\n"
             f"Баланс: {progress_data['net_calories']} ккал из {progress_data['calorie_goal']} ккал\n"
-            f"{calorie_status}"
+            f"{calorie_status}\n\n"
+            f"БЖУ:\n"
+            f"Белки: {progress_data['protein']:.1f} г | "
+            f"Углеводы: {progress_data['carbs']:.1f} г | "
+            f"Жиры: {progress_data['fat']:.1f} г"
         )
 
     @staticmethod
@@ -150,13 +157,30 @@ class MessageFormatter:
         return "Недостаточно данных для построения графиков"
 
     @staticmethod
-    def graph_caption():
-        return "Ваш прогресс за последние 7 дней"
+    def graph_caption(days=7, bucket="day"):
+        averages = {
+            "week": " (средние за день по неделям)",
+            "month": " (средние за день по месяцам)"
+        }
+        return f"Ваш прогресс за последние {days} дней{averages.get(bucket, '')}"
+
+    @staticmethod
+    def graphs_usage(periods):
+        options = ", ".join(str(days) for days in periods)
+        return f"Использование: /graphs <дней>, доступно: {options}"
 
     @staticmethod
     def generating_graphs():
         return "Генерируем графики, пожалуйста, подождите"
 
+    @staticmethod
+    def graphs_busy():
+        return "Сейчас строится слишком много графиков, попробуйте через минуту"
+
+    @staticmethod
+    def graphs_failed():
+        return "Не удалось построить график, попробуйте ещё раз"
+
     @staticmethod
     def recommendations_header():
         return "Персональные рекомендации:\n\n"
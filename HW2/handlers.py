@@ -2,9 +2,11 @@ from aiogram import Router, F
 from aiogram.types import Message, InlineKeyboardMarkup, InlineKeyboardButton, BufferedInputFile
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
+from aiogram.exceptions import TelegramBadRequest
 from states import ProfileSetup, FoodLogging, WorkoutLogging
 from services import UserService, DiaryService
 from formatters import MessageFormatter
+from config import HISTORY_PERIODS
 import charts
 import recommendation_engine
 
@@ -270,7 +272,10 @@ async def process_food_grams(message: Message, state: FSMContext):
             result['net_calories'],
             result['calorie_goal'],
             result['remaining'],
-            result['over_limit']
+            result['over_limit'],
+            result['protein_total'],
+            result['carbs_total'],
+            result['fat_total']
         )
         await message.reply(response)
 
@@ -350,6 +355,13 @@ async def cmd_check_progress(message: Message):
 
 @router.message(Command("graphs"))
 async def cmd_graphs(message: Message):
+    parts = message.text.split()
+    days = parts[1] if len(parts) > 1 else "7"
+    if not days.isdigit() or int(days) not in HISTORY_PERIODS:
+        await message.reply(MessageFormatter.graphs_usage(HISTORY_PERIODS))
+        return
+    days = int(days)
+
     user = await UserService.get_user(message.from_user.id)
     if not user:
         await message.reply(MessageFormatter.no_profile())
@@ -357,16 +369,34 @@ async def cmd_graphs(message: Message):
 
     await message.answer(MessageFormatter.generating_graphs())
 
-    graph_image = await charts.generate_progress_graph(
-        message.from_user.id,
-        days=7
-    )
+    try:
+        graph_image = await charts.generate_progress_graph(
+            message.from_user.id,
+            days=days
+        )
+    except charts.RenderQueueFull:
+        await message.reply(MessageFormatter.graphs_busy())
+        return
+    except charts.RenderFailed:
+        await message.reply(MessageFormatter.graphs_failed())
+        return
 
-    if graph_image:
-        photo = BufferedInputFile(graph_image.getvalue(), filename="progress.png")
-        await message.answer_photo(photo, caption=MessageFormatter.graph_caption())
-    else:
+    if not graph_image:
         await message.reply(MessageFormatter.insufficient_data())
+        return
+
+    caption = MessageFormatter.graph_caption(days, HISTORY_PERIODS[days])
+
+    if graph_image.file_id:
+        try:
+            await message.answer_photo(graph_image.file_id, caption=caption)
+            return
+        except TelegramBadRequest:
+            graph_image.file_id = None
+
+    photo = BufferedInputFile(graph_image.png, filename="progress.png")
+    sent = await message.answer_photo(photo, caption=caption)
+    await charts.remember_file_id(message.from_user.id, days, graph_image, sent.photo[-1].file_id)
 
 @router.message(Command("recommend"))
 async def cmd_recommend(message: Message):
@@ -1,12 +1,17 @@
 from aiohttp import web
 import asyncio
+from metrics import collect_metrics
 
 async def healthcheck(request):
     return web.Response(text="OK")
 
+async def metrics(request):
+    return web.json_response(collect_metrics())
+
 async def start_healthcheck_server():
     app = web.Application()
     app.router.add_get('/health', healthcheck)
+    app.router.add_get('/metrics', metrics)
     runner = web.AppRunner(app)
     await runner.setup()
     site = web.TCPSite(runner, '0.0.0.0', 10000)
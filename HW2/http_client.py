@@ -0,0 +1,123 @@
+import asyncio
+import random
+import time
+import aiohttp
+from config import HTTP_UPSTREAMS
+from metrics import register_metrics
+from logger import log
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class UpstreamClient:
+    def __init__(self, name, limit_per_host, timeout, max_retries, backoff_base, backoff_max,
+                 keepalive_timeout=30):
+        self.name = name
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.keepalive_timeout = keepalive_timeout
+        self.session = None
+
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.statuses = {}
+
+    async def start(self):
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+
+    async def close(self):
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    def _backoff(self, attempt, retry_after=None):
+        if retry_after is not None:
+            try:
+                return min(self.backoff_max, float(retry_after))
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def request(self, method, url, **kwargs):
+        await self.start()
+
+        for attempt in range(self.max_retries + 1):
+            self.requests += 1
+            started = time.perf_counter()
+            retry_after = None
+
+            try:
+                async with self.session.request(method, url, **kwargs) as response:
+                    status = response.status
+                    retry_after = response.headers.get('Retry-After')
+                    data = await response.json(content_type=None) if status == 200 else None
+                error = None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                status, data, error = None, None, e
+
+            latency = time.perf_counter() - started
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+            retryable = error is not None or status in RETRYABLE_STATUSES
+            if retryable:
+                self.errors += 1
+
+            if not retryable or attempt == self.max_retries:
+                break
+
+            delay = self._backoff(attempt, retry_after)
+            self.retries += 1
+            reason = f"{type(error).__name__} {error}" if error is not None else f"статус {status}"
+            log.warning(f"{self.name}: {reason}, повтор {attempt + 1}/{self.max_retries} через {delay:.2f} с")
+            await asyncio.sleep(delay)
+
+        if error is not None:
+            raise error
+        return status, data
+
+    def stats(self):
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'retries': self.retries,
+            'avg_latency_ms': self.total_latency / self.requests * 1000 if self.requests else 0.0,
+            'max_latency_ms': self.max_latency * 1000,
+            'statuses': {str(status): count for status, count in self.statuses.items()}
+        }
+
+
+_clients = {name: UpstreamClient(name, **settings) for name, settings in HTTP_UPSTREAMS.items()}
+
+
+def get_client(name):
+    return _clients[name]
+
+
+async def start_clients():
+    for client in _clients.values():
+        await client.start()
+
+
+async def close_clients():
+    for client in _clients.values():
+        await client.close()
+
+
+register_metrics("http", lambda: {name: client.stats() for name, client in _clients.items()})
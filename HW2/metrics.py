@@ -0,0 +1,9 @@
+_sources = {}
+
+
+def register_metrics(name, source):
+    _sources[name] = source
+
+
+def collect_metrics():
+    return {name: source() for name, source in _sources.items()}
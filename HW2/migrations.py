@@ -0,0 +1,192 @@
+import os
+import time
+from sqlalchemy import text
+from logger import log
+
+MIGRATION_LOCK_ID = 20240501
+
+BASE_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        user_id BIGSERIAL PRIMARY KEY,
+        username VARCHAR(255),
+        weight FLOAT NOT NULL,
+        height FLOAT NOT NULL,
+        age INTEGER NOT NULL,
+        gender VARCHAR(10) NOT NULL,
+        activity_minutes INTEGER NOT NULL,
+        city VARCHAR(100) NOT NULL,
+        custom_calorie_goal INTEGER,
+        water_goal INTEGER NOT NULL,
+        calorie_goal INTEGER NOT NULL,
+        created_at TIMESTAMP WITHOUT TIME ZONE,
+        updated_at TIMESTAMP WITHOUT TIME ZONE,
+        CONSTRAINT check_gender CHECK (gender IN ('male', 'female'))
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS daily_logs (
+        id SERIAL PRIMARY KEY,
+        user_id BIGINT NOT NULL REFERENCES users (user_id) ON DELETE CASCADE,
+        log_date DATE NOT NULL,
+        logged_water INTEGER,
+        logged_calories INTEGER,
+        burned_calories INTEGER,
+        created_at TIMESTAMP WITHOUT TIME ZONE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS food_logs (
+        id SERIAL PRIMARY KEY,
+        user_id BIGINT NOT NULL REFERENCES users (user_id) ON DELETE CASCADE,
+        product_name VARCHAR(255) NOT NULL,
+        grams FLOAT NOT NULL,
+        calories FLOAT NOT NULL,
+        protein FLOAT,
+        carbs FLOAT,
+        fat FLOAT,
+        logged_at TIMESTAMP WITHOUT TIME ZONE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS water_logs (
+        id SERIAL PRIMARY KEY,
+        user_id BIGINT NOT NULL REFERENCES users (user_id) ON DELETE CASCADE,
+        amount INTEGER NOT NULL,
+        logged_at TIMESTAMP WITHOUT TIME ZONE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS workout_logs (
+        id SERIAL PRIMARY KEY,
+        user_id BIGINT NOT NULL REFERENCES users (user_id) ON DELETE CASCADE,
+        workout_type VARCHAR(100) NOT NULL,
+        duration_minutes INTEGER NOT NULL,
+        calories_burned INTEGER NOT NULL,
+        logged_at TIMESTAMP WITHOUT TIME ZONE
+    )
+    """,
+]
+
+
+def _local_timezone_name():
+    name = os.environ.get("TZ", "").lstrip(":")
+    if not name:
+        name = os.path.realpath("/etc/localtime")
+    if "zoneinfo/" in name:
+        return name.split("zoneinfo/", 1)[1]
+    return name if name and not os.path.isabs(name) else time.tzname[0]
+
+
+async def backfill_daily_macros(conn):
+    await conn.execute(
+        text("""
+            UPDATE daily_logs d
+            SET logged_protein = f.protein, logged_carbs = f.carbs, logged_fat = f.fat
+            FROM (
+                SELECT user_id,
+                       (logged_at AT TIME ZONE 'UTC' AT TIME ZONE :tz)::date AS log_date,
+                       COALESCE(SUM(protein), 0) AS protein,
+                       COALESCE(SUM(carbs), 0) AS carbs,
+                       COALESCE(SUM(fat), 0) AS fat
+                FROM food_logs
+                WHERE logged_at IS NOT NULL
+                GROUP BY 1, 2
+            ) f
+            WHERE d.user_id = f.user_id AND d.log_date = f.log_date
+        """),
+        {"tz": _local_timezone_name()}
+    )
+
+
+MIGRATIONS = [
+    (1, "base schema", BASE_SCHEMA),
+    (2, "daily_logs unique (user_id, log_date)", [
+        """
+        DELETE FROM daily_logs d
+        USING daily_logs k
+        WHERE d.user_id = k.user_id
+          AND d.log_date = k.log_date
+          AND d.id > k.id
+        """,
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_constraint WHERE conname = 'uq_daily_logs_user_date'
+            ) THEN
+                ALTER TABLE daily_logs
+                    ADD CONSTRAINT uq_daily_logs_user_date UNIQUE (user_id, log_date);
+            END IF;
+        END $$
+        """,
+    ]),
+    (3, "(user_id, logged_at) indexes on log tables", [
+        "CREATE INDEX IF NOT EXISTS ix_water_logs_user_logged_at ON water_logs (user_id, logged_at)",
+        "CREATE INDEX IF NOT EXISTS ix_food_logs_user_logged_at ON food_logs (user_id, logged_at)",
+        "CREATE INDEX IF NOT EXISTS ix_workout_logs_user_logged_at ON workout_logs (user_id, logged_at)",
+    ]),
+    (4, "food_nutrition_cache", [
+        """
+        CREATE TABLE IF NOT EXISTS food_nutrition_cache (
+            normalized_name VARCHAR(255) PRIMARY KEY,
+            version INTEGER NOT NULL,
+            name VARCHAR(255) NOT NULL,
+            calories_per_100g FLOAT NOT NULL,
+            protein_per_100g FLOAT NOT NULL,
+            carbs_per_100g FLOAT NOT NULL,
+            fat_per_100g FLOAT NOT NULL,
+            updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+        )
+        """,
+    ]),
+    (5, "city_weather_cache", [
+        """
+        CREATE TABLE IF NOT EXISTS city_weather_cache (
+            city VARCHAR(100) PRIMARY KEY,
+            temperature FLOAT NOT NULL,
+            updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+        )
+        """,
+    ]),
+    (6, "daily_logs macronutrient totals", [
+        "ALTER TABLE daily_logs ADD COLUMN IF NOT EXISTS logged_protein DOUBLE PRECISION NOT NULL DEFAULT 0",
+        "ALTER TABLE daily_logs ADD COLUMN IF NOT EXISTS logged_carbs DOUBLE PRECISION NOT NULL DEFAULT 0",
+        "ALTER TABLE daily_logs ADD COLUMN IF NOT EXISTS logged_fat DOUBLE PRECISION NOT NULL DEFAULT 0",
+        backfill_daily_macros,
+    ]),
+]
+
+
+async def run_migrations(engine):
+    async with engine.begin() as conn:
+        await conn.execute(text("SELECT pg_advisory_xact_lock(:lock_id)"), {"lock_id": MIGRATION_LOCK_ID})
+
+        await conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                name VARCHAR(255) NOT NULL,
+                applied_at TIMESTAMP NOT NULL DEFAULT now()
+            )
+        """))
+
+        result = await conn.execute(text("SELECT version FROM schema_migrations"))
+        applied = {row.version for row in result}
+
+        for version, name, steps in MIGRATIONS:
+            if version in applied:
+                continue
+
+            log.info(f"Применение миграции {version}: {name}")
+            for step in steps:
+                if callable(step):
+                    await step(conn)
+                else:
+                    await conn.execute(text(step))
+
+            await conn.execute(
+                text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)"),
+                {"version": version, "name": name}
+            )
+
+    log.info(f"Схема БД актуальна, версия {MIGRATIONS[-1][0]}")
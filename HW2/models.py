@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, String, Float, Integer, Date, DateTime, ForeignKey, CheckConstraint
+from sqlalchemy import Column, BigInteger, String, Float, Integer, Date, DateTime, ForeignKey, CheckConstraint, UniqueConstraint, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -35,9 +35,13 @@ class DailyLog(Base):
     logged_water = Column(Integer, default=0)
     logged_calories = Column(Integer, default=0)
     burned_calories = Column(Integer, default=0)
+    logged_protein = Column(Float, default=0, server_default='0', nullable=False)
+    logged_carbs = Column(Float, default=0, server_default='0', nullable=False)
+    logged_fat = Column(Float, default=0, server_default='0', nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     __table_args__ = (
+        UniqueConstraint('user_id', 'log_date', name='uq_daily_logs_user_date'),
         {'sqlite_autoincrement': True},
     )
 
@@ -49,6 +53,10 @@ class WaterLog(Base):
     amount = Column(Integer, nullable=False)
     logged_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index('ix_water_logs_user_logged_at', 'user_id', 'logged_at'),
+    )
+
 class FoodLog(Base):
     __tablename__ = 'food_logs'
 
@@ -62,6 +70,10 @@ class FoodLog(Base):
     fat = Column(Float)
     logged_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index('ix_food_logs_user_logged_at', 'user_id', 'logged_at'),
+    )
+
 class WorkoutLog(Base):
     __tablename__ = 'workout_logs'
 
@@ -71,3 +83,28 @@ class WorkoutLog(Base):
     duration_minutes = Column(Integer, nullable=False)
     calories_burned = Column(Integer, nullable=False)
     logged_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('ix_workout_logs_user_logged_at', 'user_id', 'logged_at'),
+    )
+
+
+class FoodNutritionCache(Base):
+    __tablename__ = 'food_nutrition_cache'
+
+    normalized_name = Column(String(255), primary_key=True)
+    version = Column(Integer, nullable=False)
+    name = Column(String(255), nullable=False)
+    calories_per_100g = Column(Float, nullable=False)
+    protein_per_100g = Column(Float, nullable=False)
+    carbs_per_100g = Column(Float, nullable=False)
+    fat_per_100g = Column(Float, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class CityWeatherCache(Base):
+    __tablename__ = 'city_weather_cache'
+
+    city = Column(String(100), primary_key=True)
+    temperature = Column(Float, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
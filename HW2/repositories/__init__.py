@@ -1,4 +1,6 @@
 from .user_repository import UserRepository
 from .diary_repository import DiaryRepository
+from .nutrition_repository import NutritionRepository
+from .weather_repository import WeatherRepository
 
-__all__ = ['UserRepository', 'DiaryRepository']
+__all__ = ['UserRepository', 'DiaryRepository', 'NutritionRepository', 'WeatherRepository']
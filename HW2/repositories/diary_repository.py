@@ -1,35 +1,65 @@
-from datetime import date, timedelta
-from sqlalchemy import select, update
+from datetime import date, datetime, timedelta
+from sqlalchemy import select, literal_column, text
+from sqlalchemy.dialects.postgresql import insert
 from database import get_session
-from models import DailyLog, WaterLog, FoodLog, WorkoutLog
-from dto import DailyProgressDTO, HistoricalDataDTO
+from models import User, DailyLog, WaterLog, FoodLog, WorkoutLog
+from dto import DailyProgressDTO, DiaryWriteDTO, HistoricalDataDTO
+from config import HISTORY_PERIODS
+
+HISTORY_QUERY = text("""
+    WITH buckets AS (
+        SELECT GREATEST(bucket::date, :start_date) AS from_date,
+               LEAST((bucket + ('1 ' || :bucket)::interval)::date - 1, :end_date) AS to_date
+        FROM generate_series(
+            date_trunc(:bucket, CAST(:start_date AS date)),
+            CAST(:end_date AS date),
+            ('1 ' || :bucket)::interval
+        ) AS bucket
+    )
+    SELECT b.from_date,
+           ROUND(COALESCE(SUM(d.logged_water), 0)::numeric / (b.to_date - b.from_date + 1))::int,
+           ROUND(COALESCE(SUM(d.logged_calories), 0)::numeric / (b.to_date - b.from_date + 1))::int,
+           ROUND(COALESCE(SUM(d.burned_calories), 0)::numeric / (b.to_date - b.from_date + 1))::int,
+           COALESCE(SUM(d.logged_protein), 0) / (b.to_date - b.from_date + 1),
+           COALESCE(SUM(d.logged_carbs), 0) / (b.to_date - b.from_date + 1),
+           COALESCE(SUM(d.logged_fat), 0) / (b.to_date - b.from_date + 1)
+    FROM buckets b
+    LEFT JOIN daily_logs d
+        ON d.user_id = :user_id
+       AND d.log_date BETWEEN b.from_date AND b.to_date
+    GROUP BY b.from_date, b.to_date
+    ORDER BY b.from_date
+""")
 
 class DiaryRepository:
     @staticmethod
     async def get_or_create_daily_log_with_session(session, user_id, log_date):
-        result = await session.execute(
-            select(DailyLog).where(
-                DailyLog.user_id == user_id,
-                DailyLog.log_date == log_date
-            )
+        query = select(DailyLog).where(
+            DailyLog.user_id == user_id,
+            DailyLog.log_date == log_date
         )
-        daily_log = result.scalar_one_or_none()
+        daily_log = (await session.execute(query)).scalar_one_or_none()
 
-        if not daily_log:
-            daily_log = DailyLog(
-                user_id=user_id,
-                log_date=log_date,
-                logged_water=0,
-                logged_calories=0,
-                burned_calories=0
+        if daily_log is None:
+            await session.execute(
+                insert(DailyLog).values(
+                    user_id=user_id,
+                    log_date=log_date,
+                    logged_water=0,
+                    logged_calories=0,
+                    burned_calories=0,
+                    created_at=datetime.utcnow()
+                ).on_conflict_do_nothing(constraint='uq_daily_logs_user_date')
             )
-            session.add(daily_log)
-            await session.flush()
+            daily_log = (await session.execute(query)).scalar_one()
 
         return DailyProgressDTO(
             logged_water=daily_log.logged_water,
             logged_calories=daily_log.logged_calories,
-            burned_calories=daily_log.burned_calories
+            burned_calories=daily_log.burned_calories,
+            logged_protein=daily_log.logged_protein,
+            logged_carbs=daily_log.logged_carbs,
+            logged_fat=daily_log.logged_fat
         )
 
     @staticmethod
@@ -41,72 +71,122 @@ class DiaryRepository:
                 )
 
     @staticmethod
-    async def log_water(user_id, amount):
-        async with get_session() as session:
-            async with session.begin():
-                water_log = WaterLog(user_id=user_id, amount=amount)
-                session.add(water_log)
-
-                today = date.today()
-                await DiaryRepository.get_or_create_daily_log_with_session(
-                    session, user_id, today
-                )
-
-                await session.execute(
-                    update(DailyLog)
-                    .where(DailyLog.user_id == user_id, DailyLog.log_date == today)
-                    .values(logged_water=DailyLog.logged_water + amount)
-                )
+    def write_log_statement(raw_insert, user_id, logged_water=0, logged_calories=0, burned_calories=0,
+                            logged_protein=0.0, logged_carbs=0.0, logged_fat=0.0):
+        now = datetime.utcnow()
+        raw_log = raw_insert.returning(literal_column('1')).cte('raw_log')
+
+        stmt = insert(DailyLog).values(
+            user_id=user_id,
+            log_date=date.today(),
+            logged_water=logged_water,
+            logged_calories=logged_calories,
+            burned_calories=burned_calories,
+            logged_protein=logged_protein,
+            logged_carbs=logged_carbs,
+            logged_fat=logged_fat,
+            created_at=now
+        )
+        daily = stmt.on_conflict_do_update(
+            constraint='uq_daily_logs_user_date',
+            set_=dict(
+                logged_water=DailyLog.logged_water + stmt.excluded.logged_water,
+                logged_calories=DailyLog.logged_calories + stmt.excluded.logged_calories,
+                burned_calories=DailyLog.burned_calories + stmt.excluded.burned_calories,
+                logged_protein=DailyLog.logged_protein + stmt.excluded.logged_protein,
+                logged_carbs=DailyLog.logged_carbs + stmt.excluded.logged_carbs,
+                logged_fat=DailyLog.logged_fat + stmt.excluded.logged_fat
+            )
+        ).returning(
+            DailyLog.user_id,
+            DailyLog.logged_water,
+            DailyLog.logged_calories,
+            DailyLog.burned_calories,
+            DailyLog.logged_protein,
+            DailyLog.logged_carbs,
+            DailyLog.logged_fat
+        ).cte('daily')
+
+        return (
+            select(
+                daily.c.logged_water,
+                daily.c.logged_calories,
+                daily.c.burned_calories,
+                daily.c.logged_protein,
+                daily.c.logged_carbs,
+                daily.c.logged_fat,
+                User.water_goal,
+                User.calorie_goal
+            )
+            .join_from(daily, User, User.user_id == daily.c.user_id)
+            .add_cte(raw_log)
+        )
 
     @staticmethod
-    async def log_food(user_id, product_name, grams, calories,
-                      protein=None, carbs=None, fat=None):
+    async def _write_log(raw_insert, user_id, **totals):
+        query = DiaryRepository.write_log_statement(raw_insert, user_id, **totals)
+
         async with get_session() as session:
             async with session.begin():
-                food_log = FoodLog(
-                    user_id=user_id,
-                    product_name=product_name,
-                    grams=grams,
-                    calories=calories,
-                    protein=protein,
-                    carbs=carbs,
-                    fat=fat
-                )
-                session.add(food_log)
-
-                today = date.today()
-                await DiaryRepository.get_or_create_daily_log_with_session(
-                    session, user_id, today
-                )
-
-                await session.execute(
-                    update(DailyLog)
-                    .where(DailyLog.user_id == user_id, DailyLog.log_date == today)
-                    .values(logged_calories=DailyLog.logged_calories + int(calories))
-                )
+                row = (await session.execute(query)).one()
+
+        return DiaryWriteDTO(
+            logged_water=row.logged_water,
+            logged_calories=row.logged_calories,
+            burned_calories=row.burned_calories,
+            water_goal=row.water_goal,
+            calorie_goal=row.calorie_goal,
+            logged_protein=row.logged_protein,
+            logged_carbs=row.logged_carbs,
+            logged_fat=row.logged_fat
+        )
 
     @staticmethod
-    async def log_workout(user_id, workout_type, duration_minutes, calories_burned):
-        async with get_session() as session:
-            async with session.begin():
-                workout_log = WorkoutLog(
-                    user_id=user_id,
-                    workout_type=workout_type,
-                    duration_minutes=duration_minutes,
-                    calories_burned=calories_burned
-                )
-                session.add(workout_log)
+    async def log_water(user_id, amount) -> DiaryWriteDTO:
+        return await DiaryRepository._write_log(
+            insert(WaterLog).values(
+                user_id=user_id,
+                amount=amount,
+                logged_at=datetime.utcnow()
+            ),
+            user_id,
+            logged_water=amount
+        )
 
-                today = date.today()
-                await DiaryRepository.get_or_create_daily_log_with_session(
-                    session, user_id, today
-                )
+    @staticmethod
+    async def log_food(user_id, product_name, grams, calories,
+                      protein=None, carbs=None, fat=None) -> DiaryWriteDTO:
+        return await DiaryRepository._write_log(
+            insert(FoodLog).values(
+                user_id=user_id,
+                product_name=product_name,
+                grams=grams,
+                calories=calories,
+                protein=protein,
+                carbs=carbs,
+                fat=fat,
+                logged_at=datetime.utcnow()
+            ),
+            user_id,
+            logged_calories=int(calories),
+            logged_protein=protein or 0.0,
+            logged_carbs=carbs or 0.0,
+            logged_fat=fat or 0.0
+        )
 
-                await session.execute(
-                    update(DailyLog)
-                    .where(DailyLog.user_id == user_id, DailyLog.log_date == today)
-                    .values(burned_calories=DailyLog.burned_calories + calories_burned)
-                )
+    @staticmethod
+    async def log_workout(user_id, workout_type, duration_minutes, calories_burned) -> DiaryWriteDTO:
+        return await DiaryRepository._write_log(
+            insert(WorkoutLog).values(
+                user_id=user_id,
+                workout_type=workout_type,
+                duration_minutes=duration_minutes,
+                calories_burned=calories_burned,
+                logged_at=datetime.utcnow()
+            ),
+            user_id,
+            burned_calories=calories_burned
+        )
 
     @staticmethod
     async def get_progress(user_id, log_date):
@@ -116,38 +196,17 @@ class DiaryRepository:
     async def get_historical_data(user_id, days=7):
         end_date = date.today()
         start_date = end_date - timedelta(days=days-1)
+        bucket = HISTORY_PERIODS.get(days, 'day')
 
         async with get_session() as session:
             result = await session.execute(
-                select(DailyLog).where(
-                    DailyLog.user_id == user_id,
-                    DailyLog.log_date >= start_date,
-                    DailyLog.log_date <= end_date
-                ).order_by(DailyLog.log_date)
+                HISTORY_QUERY,
+                {
+                    'user_id': user_id,
+                    'start_date': start_date,
+                    'end_date': end_date,
+                    'bucket': bucket
+                }
             )
-            logs = result.scalars().all()
-
-            row_dict = {log.log_date: log for log in logs}
-
-            result = []
-            current_date = start_date
-
-            while current_date <= end_date:
-                if current_date in row_dict:
-                    log_entry = row_dict[current_date]
-                    result.append(HistoricalDataDTO(
-                        log_date=log_entry.log_date,
-                        logged_water=log_entry.logged_water,
-                        logged_calories=log_entry.logged_calories,
-                        burned_calories=log_entry.burned_calories
-                    ))
-                else:
-                    result.append(HistoricalDataDTO(
-                        log_date=current_date,
-                        logged_water=0,
-                        logged_calories=0,
-                        burned_calories=0
-                    ))
-                current_date += timedelta(days=1)
-
-            return result
+
+            return [HistoricalDataDTO(*row) for row in result.all()]
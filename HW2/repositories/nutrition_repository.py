@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from database import get_session
+from models import FoodNutritionCache
+from dto import FoodNutritionDTO
+
+class NutritionRepository:
+    @staticmethod
+    async def get(normalized_name, version, ttl) -> FoodNutritionDTO:
+        async with get_session() as session:
+            result = await session.execute(
+                select(FoodNutritionCache).where(
+                    FoodNutritionCache.normalized_name == normalized_name,
+                    FoodNutritionCache.version == version,
+                    FoodNutritionCache.updated_at >= datetime.utcnow() - timedelta(seconds=ttl)
+                )
+            )
+            entry = result.scalar_one_or_none()
+
+            if entry:
+                return FoodNutritionDTO(
+                    name=entry.name,
+                    calories_per_100g=entry.calories_per_100g,
+                    protein_per_100g=entry.protein_per_100g,
+                    carbs_per_100g=entry.carbs_per_100g,
+                    fat_per_100g=entry.fat_per_100g
+                )
+            return None
+
+    @staticmethod
+    async def save(normalized_name, version, nutrition: FoodNutritionDTO):
+        values = dict(
+            version=version,
+            name=nutrition.name,
+            calories_per_100g=nutrition.calories_per_100g,
+            protein_per_100g=nutrition.protein_per_100g,
+            carbs_per_100g=nutrition.carbs_per_100g,
+            fat_per_100g=nutrition.fat_per_100g,
+            updated_at=datetime.utcnow()
+        )
+
+        async with get_session() as session:
+            async with session.begin():
+                stmt = insert(FoodNutritionCache).values(normalized_name=normalized_name, **values)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=['normalized_name'],
+                    set_=values
+                )
+                await session.execute(stmt)
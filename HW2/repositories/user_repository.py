@@ -3,8 +3,17 @@ from sqlalchemy.dialects.postgresql import insert
 from database import get_session
 from models import User
 from dto import UserDTO
+from cache import Cache, MemoryTTLCache
+from config import USER_CACHE_TTL, USER_CACHE_SIZE
+from metrics import register_metrics
 
 class UserRepository:
+    cache = Cache(MemoryTTLCache(USER_CACHE_SIZE), USER_CACHE_TTL, "user")
+
+    @classmethod
+    def set_cache_backend(cls, backend):
+        cls.cache.backend = backend
+
     @staticmethod
     async def create_or_update(user_id, username, weight, height, age, gender,
                                activity_minutes, city, water_goal, calorie_goal,
@@ -41,10 +50,18 @@ class UserRepository:
                     )
                 )
 
-                await session.execute(stmt)
+                result = await session.execute(stmt.returning(User))
+                user_dto = UserRepository._to_dto(result.scalar_one())
+
+        await UserRepository.cache.write(user_id, user_dto)
 
     @staticmethod
     async def get_by_id(user_id) -> UserDTO:
+        cached = await UserRepository.cache.get(user_id)
+        if cached is not None:
+            return cached
+
+        generation = UserRepository.cache.generation
         async with get_session() as session:
             result = await session.execute(
                 select(User).where(User.user_id == user_id)
@@ -52,17 +69,26 @@ class UserRepository:
             user = result.scalar_one_or_none()
 
             if user:
-                return UserDTO(
-                    user_id=user.user_id,
-                    username=user.username,
-                    weight=user.weight,
-                    height=user.height,
-                    age=user.age,
-                    gender=user.gender,
-                    activity_minutes=user.activity_minutes,
-                    city=user.city,
-                    water_goal=user.water_goal,
-                    calorie_goal=user.calorie_goal,
-                    custom_calorie_goal=user.custom_calorie_goal
-                )
+                user_dto = UserRepository._to_dto(user)
+                await UserRepository.cache.set(user_id, user_dto, generation)
+                return user_dto
             return None
+
+    @staticmethod
+    def _to_dto(user) -> UserDTO:
+        return UserDTO(
+            user_id=user.user_id,
+            username=user.username,
+            weight=user.weight,
+            height=user.height,
+            age=user.age,
+            gender=user.gender,
+            activity_minutes=user.activity_minutes,
+            city=user.city,
+            water_goal=user.water_goal,
+            calorie_goal=user.calorie_goal,
+            custom_calorie_goal=user.custom_calorie_goal
+        )
+
+
+register_metrics("user_cache", UserRepository.cache.stats)
@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from database import get_session
+from models import CityWeatherCache
+
+class WeatherRepository:
+    @staticmethod
+    async def get_temperature(city, ttl):
+        async with get_session() as session:
+            result = await session.execute(
+                select(CityWeatherCache.temperature).where(
+                    CityWeatherCache.city == city,
+                    CityWeatherCache.updated_at >= datetime.utcnow() - timedelta(seconds=ttl)
+                )
+            )
+            return result.scalar_one_or_none()
+
+    @staticmethod
+    async def save_temperature(city, temperature):
+        now = datetime.utcnow()
+
+        async with get_session() as session:
+            async with session.begin():
+                stmt = insert(CityWeatherCache).values(
+                    city=city,
+                    temperature=temperature,
+                    updated_at=now
+                )
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=['city'],
+                    set_=dict(temperature=temperature, updated_at=now)
+                )
+                await session.execute(stmt)
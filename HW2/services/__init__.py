@@ -1,4 +1,6 @@
 from .user_service import UserService
 from .diary_service import DiaryService
+from .nutrition_service import NutritionService
+from .weather_service import WeatherService
 
-__all__ = ['UserService', 'DiaryService']
+__all__ = ['UserService', 'DiaryService', 'NutritionService', 'WeatherService']
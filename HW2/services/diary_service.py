@@ -1,39 +1,36 @@
 from datetime import date
-import API
 import calculations
 from repositories import DiaryRepository, UserRepository
 from dto import DailyProgressDTO
+from services.nutrition_service import NutritionService
 from logger import log
+import charts
 
 class DiaryService:
     @staticmethod
     async def log_water(user_id, amount):
-        await DiaryRepository.log_water(user_id, amount)
+        progress = await DiaryRepository.log_water(user_id, amount)
+        await charts.invalidate_user_charts(user_id)
 
-        user = await UserRepository.get_by_id(user_id)
-        progress = await DiaryRepository.get_progress(user_id, date.today())
-
-        remaining = max(0, user.water_goal - progress.logged_water)
+        remaining = max(0, progress.water_goal - progress.logged_water)
 
         return {
             'amount': amount,
             'logged_water': progress.logged_water,
-            'water_goal': user.water_goal,
+            'water_goal': progress.water_goal,
             'remaining': remaining,
             'goal_reached': remaining == 0
         }
 
     @staticmethod
     async def log_food(user_id, product_name, grams, calories, protein, carbs, fat):
-        await DiaryRepository.log_food(
+        progress = await DiaryRepository.log_food(
             user_id, product_name, grams, calories, protein, carbs, fat
         )
-
-        user = await UserRepository.get_by_id(user_id)
-        progress = await DiaryRepository.get_progress(user_id, date.today())
+        await charts.invalidate_user_charts(user_id)
 
         net_calories = progress.logged_calories - progress.burned_calories
-        remaining = user.calorie_goal - net_calories
+        remaining = progress.calorie_goal - net_calories
 
         return {
             'calories': calories,
@@ -41,9 +38,12 @@ class DiaryService:
             'carbs': carbs,
             'fat': fat,
             'net_calories': net_calories,
-            'calorie_goal': user.calorie_goal,
+            'calorie_goal': progress.calorie_goal,
             'remaining': remaining,
-            'over_limit': remaining < 0
+            'over_limit': remaining < 0,
+            'protein_total': progress.logged_protein,
+            'carbs_total': progress.logged_carbs,
+            'fat_total': progress.logged_fat
         }
 
     @staticmethod
@@ -56,11 +56,11 @@ class DiaryService:
 
         extra_water = int((duration_minutes / 30) * 200)
 
-        await DiaryRepository.log_workout(
+        progress = await DiaryRepository.log_workout(
             user_id, workout_type, duration_minutes, calories_burned
         )
+        await charts.invalidate_user_charts(user_id)
 
-        progress = await DiaryRepository.get_progress(user_id, date.today())
         net_calories = progress.logged_calories - progress.burned_calories
 
         return {
@@ -69,7 +69,7 @@ class DiaryService:
             'calories_burned': calories_burned,
             'extra_water': extra_water,
             'net_calories': net_calories,
-            'calorie_goal': user.calorie_goal
+            'calorie_goal': progress.calorie_goal
         }
 
     @staticmethod
@@ -99,12 +99,15 @@ class DiaryService:
             'net_calories': net_calories,
             'calorie_goal': calorie_goal,
             'calorie_remaining': calorie_remaining,
-            'calorie_percent': calorie_percent
+            'calorie_percent': calorie_percent,
+            'protein': progress.logged_protein,
+            'carbs': progress.logged_carbs,
+            'fat': progress.logged_fat
         }
 
     @staticmethod
     async def search_food(product_name):
-        food_info = await API.search_food_nutrition(product_name)
+        food_info = await NutritionService.lookup(product_name)
 
         if not food_info:
             log.warning(f"Продукт не найден {product_name}")
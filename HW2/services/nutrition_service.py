@@ -0,0 +1,94 @@
+from dataclasses import asdict
+import API
+from cache import Cache, MemoryTTLCache, SingleFlight
+from config import (
+    NUTRITION_CACHE_VERSION, NUTRITION_CACHE_TTL, NUTRITION_CACHE_SIZE,
+    LOCAL_FOODS_PATH, EXTRA_FOODS_PATHS, FOOD_MATCH_THRESHOLD
+)
+from dto import FoodNutritionDTO
+from food_search import FoodIndex, normalize_food_name
+from metrics import register_metrics
+from repositories import NutritionRepository
+from logger import log
+
+class NutritionService:
+    cache = Cache(
+        MemoryTTLCache(NUTRITION_CACHE_SIZE),
+        NUTRITION_CACHE_TTL,
+        f"nutrition:v{NUTRITION_CACHE_VERSION}"
+    )
+    flight = SingleFlight()
+    index = FoodIndex(threshold=FOOD_MATCH_THRESHOLD)
+    local_hits = 0
+    db_hits = 0
+    llm_calls = 0
+
+    @staticmethod
+    async def load_local_foods():
+        for path in [LOCAL_FOODS_PATH, *EXTRA_FOODS_PATHS]:
+            NutritionService.index.load_csv(
+                path,
+                lambda name, row: FoodNutritionDTO(
+                    name=name,
+                    calories_per_100g=float(row['calories']),
+                    protein_per_100g=float(row['protein']),
+                    carbs_per_100g=float(row['carbs']),
+                    fat_per_100g=float(row['fat'])
+                )
+            )
+
+        log.info(f"Локальная база продуктов: {len(NutritionService.index)} названий")
+
+    @staticmethod
+    async def lookup(product_name):
+        key = normalize_food_name(product_name)
+        if not key:
+            return None
+
+        nutrition = NutritionService.index.match(product_name)
+        if nutrition is not None:
+            NutritionService.local_hits += 1
+            return asdict(nutrition)
+
+        nutrition = await NutritionService.cache.get(key)
+        if nutrition is None:
+            nutrition = await NutritionService.flight.do(key, NutritionService._load, key, product_name)
+
+        if nutrition is None:
+            return None
+        return asdict(nutrition)
+
+    @staticmethod
+    async def _load(key, product_name):
+        nutrition = await NutritionRepository.get(key, NUTRITION_CACHE_VERSION, NUTRITION_CACHE_TTL)
+
+        if nutrition is not None:
+            NutritionService.db_hits += 1
+        else:
+            NutritionService.llm_calls += 1
+            food_info = await API.search_food_nutrition(product_name)
+            if not food_info:
+                return None
+
+            nutrition = FoodNutritionDTO(**food_info)
+            try:
+                await NutritionRepository.save(key, NUTRITION_CACHE_VERSION, nutrition)
+            except Exception as e:
+                log.error(f"Не удалось сохранить КБЖУ {product_name} в кэш: {e}")
+
+        await NutritionService.cache.set(key, nutrition)
+        return nutrition
+
+    @staticmethod
+    def stats():
+        return {
+            'memory': NutritionService.cache.stats(),
+            'single_flight': NutritionService.flight.stats(),
+            'local_foods': len(NutritionService.index),
+            'local_hits': NutritionService.local_hits,
+            'db_hits': NutritionService.db_hits,
+            'llm_calls': NutritionService.llm_calls
+        }
+
+
+register_metrics("nutrition_cache", NutritionService.stats)
@@ -1,14 +1,15 @@
-import API
 import calculations
 from repositories import UserRepository
 from dto import UserDTO
+from services.weather_service import WeatherService
 from logger import log
+import charts
 
 class UserService:
     @staticmethod
     async def create_profile(user_id, username, weight, height, age, gender,
                            activity_minutes, city, custom_calorie_goal=None):
-        temperature = await API.get_temperature(city)
+        temperature = await WeatherService.get_temperature(city)
         if temperature is None:
             temperature = 20
             log.warning(f"Нет данных о температуре для {city}, используем 20С по умолчанию")
@@ -34,6 +35,7 @@ class UserService:
             calorie_goal=calorie_norm,
             custom_calorie_goal=custom_calorie_goal
         )
+        await charts.invalidate_user_charts(user_id)
 
         return {
             'water_goal': water_norm,
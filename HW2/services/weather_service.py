@@ -0,0 +1,61 @@
+import API
+from cache import Cache, MemoryTTLCache, SingleFlight
+from config import WEATHER_CACHE_TTL, WEATHER_CACHE_SIZE, WEATHER_CACHE_DB
+from metrics import register_metrics
+from repositories import WeatherRepository
+from logger import log
+
+class WeatherService:
+    cache = Cache(MemoryTTLCache(WEATHER_CACHE_SIZE), WEATHER_CACHE_TTL, "weather")
+    flight = SingleFlight()
+    db_hits = 0
+    api_calls = 0
+
+    @staticmethod
+    async def get_temperature(city):
+        key = ' '.join(city.lower().replace('ё', 'е').split())
+
+        temperature = await WeatherService.cache.get(key)
+        if temperature is not None:
+            return temperature
+
+        return await WeatherService.flight.do(key, WeatherService._load, key, city)
+
+    @staticmethod
+    async def _load(key, city):
+        temperature = None
+
+        if WEATHER_CACHE_DB:
+            try:
+                temperature = await WeatherRepository.get_temperature(key, WEATHER_CACHE_TTL)
+            except Exception as e:
+                log.error(f"Не удалось прочитать кэш погоды для {city}: {e}")
+
+        if temperature is not None:
+            WeatherService.db_hits += 1
+        else:
+            WeatherService.api_calls += 1
+            temperature = await API.get_temperature(city)
+            if temperature is None:
+                return None
+
+            if WEATHER_CACHE_DB:
+                try:
+                    await WeatherRepository.save_temperature(key, temperature)
+                except Exception as e:
+                    log.error(f"Не удалось сохранить погоду для {city}: {e}")
+
+        await WeatherService.cache.set(key, temperature)
+        return temperature
+
+    @staticmethod
+    def stats():
+        return {
+            'memory': WeatherService.cache.stats(),
+            'single_flight': WeatherService.flight.stats(),
+            'db_hits': WeatherService.db_hits,
+            'api_calls': WeatherService.api_calls
+        }
+
+
+register_metrics("weather_cache", WeatherService.stats)
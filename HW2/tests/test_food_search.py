@@ -0,0 +1,56 @@
+import pytest
+
+from config import LOCAL_FOODS_PATH
+from food_search import FoodIndex, normalize_food_name
+
+
+@pytest.fixture(scope="module")
+def foods():
+    index = FoodIndex()
+    index.load_csv(LOCAL_FOODS_PATH, lambda name, row: name)
+    return index
+
+
+@pytest.fixture
+def lookalikes():
+    index = FoodIndex()
+    for name in ("Водка", "Маслины", "Хлебцы", "Соленые огурцы", "Салат Цезарь", "Apple"):
+        index.add(name, name)
+    return index
+
+
+def test_normalize_ignores_case_order_and_endings():
+    assert normalize_food_name("Куриную грудку") == normalize_food_name("грудка куриная")
+    assert normalize_food_name("Бананы, Яблоки!") == normalize_food_name("яблоко банан")
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("вода", "Вода"),
+    ("масло", "Масло"),
+    ("хлеб", "Хлеб"),
+    ("огурцы", "Огурцы"),
+    ("салат", "Салат"),
+    ("apple pie", "Apple pie"),
+    ("бананы", "Банан"),
+    ("салат греческий", "Греческий салат"),
+])
+def test_base_foods_match_themselves(foods, query, expected):
+    assert foods.match(query) == expected
+
+
+@pytest.mark.parametrize("query", ["вода", "масло", "хлеб", "огурцы", "салат", "apple pie"])
+def test_partial_names_do_not_match(lookalikes, query):
+    assert lookalikes.match(query) is None
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Молочный шоколадд", "Шоколад молочный"),
+    ("blueberies", "Blueberry"),
+])
+def test_typos_match(foods, query, expected):
+    assert foods.match(query) == expected
+
+
+@pytest.mark.parametrize("query", ["сыр твердый", "pie", "кефирчик"])
+def test_unknown_words_fall_through(foods, query):
+    assert foods.match(query) is None
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import os
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from migrations import run_migrations
+from models import FoodLog
+from repositories.diary_repository import DiaryRepository, HISTORY_QUERY
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL не задан")
+
+USERS = 2000
+DAYS = 60
+
+SEED = [
+    """
+    INSERT INTO users (user_id, weight, height, age, gender, activity_minutes, city, water_goal, calorie_goal)
+    SELECT id, 70, 175, 30, 'male', 30, 'Moscow', 2400, 2100
+    FROM generate_series(1, :users) AS id
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO daily_logs (user_id, log_date, logged_water, logged_calories, burned_calories)
+    SELECT u, CURRENT_DATE - d, 2000, 1800, 300
+    FROM generate_series(1, :users) AS u, generate_series(1, :days) AS d
+    ON CONFLICT DO NOTHING
+    """,
+    "ANALYZE users",
+    "ANALYZE daily_logs",
+]
+
+
+def _nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+
+async def _explain(conn, statement, params=None):
+    result = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {statement}"), params or {})
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return list(_nodes(plan[0]["Plan"]))
+
+
+async def _collect_plans():
+    engine = create_async_engine(TEST_DATABASE_URL.replace('postgresql://', 'postgresql+asyncpg://'))
+    try:
+        await run_migrations(engine)
+
+        async with engine.connect() as conn:
+            transaction = await conn.begin()
+            try:
+                for statement in SEED:
+                    await conn.execute(text(statement), {"users": USERS, "days": DAYS})
+
+                history = await _explain(conn, HISTORY_QUERY.text, {
+                    "user_id": USERS // 2,
+                    "start_date": date.today() - timedelta(days=29),
+                    "end_date": date.today(),
+                    "bucket": "day"
+                })
+
+                write = DiaryRepository.write_log_statement(
+                    insert(FoodLog).values(
+                        user_id=USERS // 2,
+                        product_name="банан",
+                        grams=100.0,
+                        calories=89.0,
+                        protein=1.1,
+                        carbs=22.8,
+                        fat=0.3,
+                        logged_at=datetime.utcnow()
+                    ),
+                    USERS // 2,
+                    logged_calories=89,
+                    logged_protein=1.1,
+                    logged_carbs=22.8,
+                    logged_fat=0.3
+                )
+                compiled = write.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+                write_plan = await _explain(conn, str(compiled))
+            finally:
+                await transaction.rollback()
+    finally:
+        await engine.dispose()
+
+    return history, write_plan
+
+
+@pytest.fixture(scope="module")
+def plans():
+    return asyncio.run(_collect_plans())
+
+
+def test_history_query_uses_daily_log_key(plans):
+    history, _ = plans
+
+    assert not [node for node in history if node["Node Type"] == "Seq Scan"
+                and node.get("Relation Name") == "daily_logs"]
+    assert "uq_daily_logs_user_date" in {node.get("Index Name") for node in history}
+
+
+def test_diary_write_upserts_on_daily_log_key(plans):
+    _, write_plan = plans
+
+    upserts = [node for node in write_plan if node["Node Type"] == "ModifyTable"
+               and node.get("Relation Name") == "daily_logs"]
+    assert len(upserts) == 1
+    assert upserts[0]["Conflict Arbiter Indexes"] == ["uq_daily_logs_user_date"]
+
+
+def test_diary_write_reads_goals_by_primary_key(plans):
+    _, write_plan = plans
+
+    assert not [node for node in write_plan if node["Node Type"] == "Seq Scan"]
+    assert "users_pkey" in {node.get("Index Name") for node in write_plan}